@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
 from collections.abc import Iterable
 from pathlib import Path
 
@@ -18,9 +19,12 @@ SUPPORTED_EXTS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp")
 
 
 def iter_images(input_dir: Path) -> Iterable[Path]:
-    for path in sorted(input_dir.iterdir()):
-        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTS:
-            yield path
+    # scandir hands back the d_type from readdir, so is_file() needs no extra stat.
+    with os.scandir(input_dir) as it:
+        names = [e.name for e in it if e.name.lower().endswith(SUPPORTED_EXTS) and e.is_file()]
+    names.sort()
+    for name in names:
+        yield input_dir / name
 
 
 def convert_image(
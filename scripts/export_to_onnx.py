@@ -9,6 +9,7 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
 import sys
 from collections.abc import Iterable
 from pathlib import Path
@@ -99,13 +100,14 @@ class YoloCalibrationDataReader(CalibrationDataReader):
 def _collect_calibration_images(calibration_dir: Path, limit: int | None = None) -> list[Path]:
     if not calibration_dir.exists():
         return []
-    images = [
-        p
-        for p in calibration_dir.iterdir()
-        if p.is_file() and p.suffix.lower() in SUPPORTED_IMAGE_EXTS
-    ]
-    images.sort()
-    return images[:limit] if limit else images
+    with os.scandir(calibration_dir) as it:
+        names = [
+            e.name for e in it if e.name.lower().endswith(SUPPORTED_IMAGE_EXTS) and e.is_file()
+        ]
+    names.sort()
+    if limit:
+        names = names[:limit]
+    return [calibration_dir / name for name in names]
 
 
 def export_to_onnx(
@@ -87,32 +87,42 @@ def clamp(v: float, lo: float, hi: float) -> float:
     return lo if v < lo else hi if v > hi else v
 
 
-def yolo_labels_to_geojson(
-    label_path: Path, *, image_width: int, image_height: int, class_names: list[str]
-) -> dict:
-    features: list[dict] = []
-    counts: dict[str, int] = {}
+def read_yolo_label_rows(
+    label_path: Path,
+) -> tuple[list[tuple[int, tuple[int, float, float, float, float]]], int]:
+    """Read `class cx cy w h` rows from a YOLO label file.
+
+    Returns ([(line_idx, (class_id, cx, cy, w, h)), ...], num_skipped). Blank lines are
+    ignored; short or unparseable lines (including a nan/inf class id) are skipped.
+    Extra columns (e.g. segmentation points) are ignored.
+    """
+    parsed: list[tuple[int, tuple[int, float, float, float, float]]] = []
     num_skipped = 0
-
     for idx, raw in enumerate(label_path.read_text(encoding="utf-8").splitlines()):
-        line = raw.strip()
-        if not line:
+        parts = raw.split()
+        if not parts:
             continue
-        parts = line.split()
         if len(parts) < 5:
             num_skipped += 1
             continue
-
         try:
             class_id = int(float(parts[0]))
-            cx = float(parts[1])
-            cy = float(parts[2])
-            w = float(parts[3])
-            h = float(parts[4])
-        except ValueError:
+            cx, cy, w, h = (float(v) for v in parts[1:5])
+        except (ValueError, OverflowError):
             num_skipped += 1
             continue
+        parsed.append((idx, (class_id, cx, cy, w, h)))
+    return parsed, num_skipped
+
 
+def yolo_labels_to_geojson(
+    label_path: Path, *, image_width: int, image_height: int, class_names: list[str]
+) -> dict:
+    features: list[dict] = []
+    counts: dict[str, int] = {}
+    rows, num_skipped = read_yolo_label_rows(label_path)
+
+    for idx, (class_id, cx, cy, w, h) in rows:
         # YOLO: normalized center-x/center-y/width/height (0..1)
         cx_px = cx * image_width
         cy_px = cy * image_height
@@ -166,9 +176,22 @@ def yolo_labels_to_geojson(
     }
 
 
-def write_json(path: Path, data: object) -> None:
+def write_json(path: Path, data: object) -> bool:
+    """Write `data` as JSON unless the file already holds identical bytes.
+
+    Returns True if the file was written. Skipping no-op writes keeps mtimes stable so
+    re-running the import does not dirty the static site or invalidate caches.
+    """
+    new_bytes = (json.dumps(data, indent=2, sort_keys=False) + "\n").encode("utf-8")
+    try:
+        if path.read_bytes() == new_bytes:
+            LOG.debug("Unchanged: %s", path.as_posix())
+            return False
+    except FileNotFoundError:
+        pass
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, sort_keys=False) + "\n", encoding="utf-8")
+    path.write_bytes(new_bytes)
+    return True
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -229,10 +252,12 @@ def main(argv: list[str] | None = None) -> int:
     index_file: Path = args.index_file or (cases_out / "dataset-samples.json")
 
     class_names = parse_names_from_ultralytics_yaml(args.data_yaml)
+    # Resolve every id before converting anything so a typo fails without partial output.
+    items = [find_dataset_item(dataset_root, i, splits=list(args.splits)) for i in args.ids]
 
     entries: list[dict] = []
-    for image_id in args.ids:
-        item = find_dataset_item(dataset_root, image_id, splits=list(args.splits))
+    for item in items:
+        image_id = item.image_id
         webp_path = images_out / f"{image_id}.webp"
         width, height = convert_to_webp(item.image_path, webp_path, overwrite=args.overwrite)
 
@@ -4,47 +4,142 @@
 from __future__ import annotations
 
 import argparse
-import http.server
-import os
+import stat
+from mimetypes import guess_type
 from pathlib import Path
-from typing import ClassVar
-from urllib.parse import urlparse
-
-
-class StaticHandler(http.server.SimpleHTTPRequestHandler):
-    add_headers: ClassVar[dict[str, str]] = {
-        "Cross-Origin-Opener-Policy": "same-origin",
-        "Cross-Origin-Embedder-Policy": "require-corp",
-        "Cross-Origin-Resource-Policy": "same-origin",
-        "Access-Control-Allow-Origin": "*",
-    }
-    index_path: ClassVar[Path]
-
-    def end_headers(self):
-        path = urlparse(self.path).path
-        if path.endswith((".html", ".js", ".mjs", ".css", ".onnx", ".json")) or path in ("/", ""):
-            self.send_header("Cache-Control", "no-store")
-        for k, v in self.add_headers.items():
-            self.send_header(k, v)
-        super().end_headers()
-
-    def do_GET(self):  # noqa: N802 - upstream naming
-        # Map "/" to the configured index (defaults to public/index.html)
-        if self.path in ("/", ""):
-            return self._serve_index()
-        return super().do_GET()
-
-    def _serve_index(self):
+
+import anyio
+import uvicorn
+from starlette.applications import Starlette
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CROSS_ORIGIN_HEADERS = {
+    "Cross-Origin-Opener-Policy": "same-origin",
+    "Cross-Origin-Embedder-Policy": "require-corp",
+    "Cross-Origin-Resource-Policy": "same-origin",
+    "Access-Control-Allow-Origin": "*",
+}
+NO_STORE_SUFFIXES = (".html", ".js", ".mjs", ".css", ".onnx", ".json")
+# Assets that may ship with precompressed siblings (e.g. best.onnx.br, niivue.js.gz).
+PRECOMPRESSED_SUFFIXES = (".js", ".mjs", ".css", ".wasm", ".onnx", ".json")
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(header: str) -> dict[str, bool]:
+    """Map each coding named in an Accept-Encoding header to whether it is acceptable (q > 0)."""
+    accepted: dict[str, bool] = {}
+    for token in header.split(","):
+        coding, *params = (part.strip() for part in token.split(";"))
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q > 0
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves `foo.br`/`foo.gz` for `foo` when the client accepts it."""
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if not path.endswith(PRECOMPRESSED_SUFFIXES):
+            return await super().get_response(path, scope)
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if not accepted.get(encoding, accepted.get("*", False)):
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                continue
+            response = self.file_response(full_path, stat_result, scope)
+            if response.status_code == 200:
+                media_type = guess_type(path)[0] or "text/plain"
+                if media_type.startswith("text/"):
+                    media_type += "; charset=utf-8"
+                response.headers["Content-Type"] = media_type
+            response.headers["Content-Encoding"] = encoding
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+
+        response = await super().get_response(path, scope)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+class StaticHeadersMiddleware:
+    """Add the cross-origin isolation headers (and no-store for app code) to every response."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        no_store = path.endswith(NO_STORE_SUFFIXES) or path in ("/", "")
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if no_store:
+                    headers["Cache-Control"] = "no-store"
+                for k, v in CROSS_ORIGIN_HEADERS.items():
+                    headers[k] = v
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class IndexPage:
+    """The index file held in memory, re-read only when its mtime or size changes."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._cache: tuple[int, int, bytes] | None = None
+
+    def read(self) -> bytes | None:
         try:
-            with open(self.index_path, "rb") as f:
-                data = f.read()
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.send_header("Content-Length", str(len(data)))
-            self.end_headers()
-            self.wfile.write(data)
+            st = self.path.stat()
         except FileNotFoundError:
-            self.send_error(404, "Index file not found")
+            return None
+        cache = self._cache
+        if cache is None or cache[0] != st.st_mtime_ns or cache[1] != st.st_size:
+            cache = (st.st_mtime_ns, st.st_size, self.path.read_bytes())
+            self._cache = cache
+        return cache[2]
+
+
+def build_app(root: Path, index_path: Path) -> ASGIApp:
+    """Build the ASGI app: "/" serves the configured index, everything else comes from root."""
+    index_page = IndexPage(index_path)
+
+    async def serve_index(request: Request) -> Response:
+        data = index_page.read()
+        if data is None:
+            return PlainTextResponse("Index file not found", status_code=404)
+        return Response(data, media_type="text/html; charset=utf-8")
+
+    app = Starlette(
+        routes=[
+            Route("/", serve_index, methods=["GET", "HEAD"]),
+            Mount("/", app=PrecompressedStaticFiles(directory=root, html=True), name="static"),
+        ]
+    )
+    return StaticHeadersMiddleware(app)
 
 
 def main():
@@ -65,14 +160,12 @@ def main():
     )
     args = parser.parse_args()
 
-    # Configure handler
-    StaticHandler.index_path = args.index
-    os.chdir(args.root)
+    app = build_app(args.root.resolve(), args.index.resolve())
 
-    with http.server.ThreadingHTTPServer(("", args.port), StaticHandler) as httpd:
-        print(f"Serving {args.root} at http://localhost:{args.port}/ (index -> {args.index})")
-        print("Headers: COOP/COEP set for WASM multithreading.")
-        httpd.serve_forever()
+    print(f"Serving {args.root} at http://localhost:{args.port}/ (index -> {args.index})")
+    print("Headers: COOP/COEP set for WASM multithreading.")
+    # uvicorn picks httptools/uvloop automatically when they are installed.
+    uvicorn.run(app, host="0.0.0.0", port=args.port)
 
 
 if __name__ == "__main__":
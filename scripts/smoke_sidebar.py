@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Smoke-check that the viewer sidebar is visible, on top, and toggles across browsers/DPRs.
+
+Run against a running server (static or FastAPI):
+
+    pixi run serve-static
+    pixi run smoke-sidebar
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from playwright.sync_api import Browser, Page, sync_playwright
+
+BROWSERS = ("chromium", "webkit")
+DEFAULT_DPRS = (1.0, 1.25, 1.5)
+VIEWPORT = {"width": 1280, "height": 720}
+TOGGLE_TIMEOUT_MS = 1_000
+
+# One round trip for everything run_check needs to know about the sidebar.
+_JS_SIDEBAR_STATE = """() => {
+  const s = document.getElementById('sidebar');
+  if (!s) return { className: '', visible: false, clickable: false };
+  const r = s.getBoundingClientRect();
+  const cs = window.getComputedStyle(s);
+  const visible = cs.display !== 'none' && cs.visibility !== 'hidden'
+    && r.width > 0 && r.height > 0;
+  const el = document.elementFromPoint(
+    r.x + Math.min(20, r.width / 2), r.y + Math.min(20, r.height / 2));
+  return {
+    className: s.className,
+    visible,
+    clickable: visible && Boolean(el && el.closest && el.closest('#sidebar')),
+  };
+}"""
+_JS_CLASS_CHANGED = "cls => document.getElementById('sidebar').className !== cls"
+# CSS transitions on the sidebar show up in getAnimations() while they run.
+_JS_SIDEBAR_SETTLED = """() => {
+  const s = document.getElementById('sidebar');
+  return !s || s.getAnimations().every(a => a.playState !== 'running');
+}"""
+
+
+@dataclass(frozen=True)
+class SidebarResult:
+    browser: str
+    dpr: float
+    visible: bool
+    clickable: bool
+    hidden_after_toggle: bool
+    restored_after_toggle: bool
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return (
+            self.error is None
+            and self.visible
+            and self.clickable
+            and self.hidden_after_toggle
+            and self.restored_after_toggle
+        )
+
+
+def _sidebar_state(page: Page) -> dict:
+    return page.evaluate(_JS_SIDEBAR_STATE)
+
+
+def _toggle_sidebar(page: Page, prev_cls: str) -> dict:
+    """Click the menu button, wait for the class change and transition, return the new state."""
+    page.click("#mobileMenuBtn")
+    page.wait_for_function(_JS_CLASS_CHANGED, arg=prev_cls, timeout=TOGGLE_TIMEOUT_MS)
+    page.wait_for_function(_JS_SIDEBAR_SETTLED, timeout=TOGGLE_TIMEOUT_MS)
+    return _sidebar_state(page)
+
+
+def run_check(browser: Browser, browser_name: str, url: str, dpr: float) -> SidebarResult:
+    """Load the viewer in a fresh context at the given DPR and toggle the sidebar twice."""
+    context = browser.new_context(viewport=VIEWPORT, device_scale_factor=dpr)
+    try:
+        page = context.new_page()
+        page.goto(url, wait_until="domcontentloaded")
+        page.wait_for_selector("#mobileMenuBtn", timeout=10_000)
+        page.wait_for_function("typeof window.toggleSidebar === 'function'", timeout=10_000)
+
+        initial = _sidebar_state(page)
+        toggled = _toggle_sidebar(page, initial["className"])
+        restored = _toggle_sidebar(page, toggled["className"])
+
+        return SidebarResult(
+            browser=browser_name,
+            dpr=dpr,
+            visible=initial["visible"],
+            clickable=initial["clickable"],
+            hidden_after_toggle=not toggled["visible"],
+            restored_after_toggle=restored["visible"] and restored["clickable"],
+        )
+    except Exception as e:
+        return SidebarResult(browser_name, dpr, False, False, False, False, error=str(e))
+    finally:
+        context.close()
+
+
+def run_browser(
+    browser_name: str, url: str, dprs: list[float], cdp_endpoint: str | None = None
+) -> list[SidebarResult]:
+    """Launch (or attach to) one browser and check every DPR against it.
+
+    Playwright's sync objects are bound to the thread that created them, so each
+    worker thread owns its own `sync_playwright()` instance.
+    """
+    with sync_playwright() as p:
+        if cdp_endpoint and browser_name == "chromium":
+            # Reuse an already-running Chromium; close() only disconnects.
+            browser = p.chromium.connect_over_cdp(cdp_endpoint)
+        else:
+            browser = getattr(p, browser_name).launch(headless=True)
+        try:
+            return [run_check(browser, browser_name, url, dpr) for dpr in dprs]
+        finally:
+            browser.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Smoke-test the viewer sidebar in real browsers.")
+    parser.add_argument("--url", default="http://localhost:8000/", help="Viewer URL.")
+    parser.add_argument(
+        "--browsers",
+        nargs="+",
+        choices=BROWSERS,
+        default=list(BROWSERS),
+        help="Browsers to check (default: chromium webkit).",
+    )
+    parser.add_argument(
+        "--dprs",
+        nargs="+",
+        type=float,
+        default=list(DEFAULT_DPRS),
+        help="Device scale factors to emulate (default: 1.0 1.25 1.5).",
+    )
+    parser.add_argument(
+        "--cdp-endpoint",
+        default=None,
+        help=(
+            "Attach to a running Chromium (e.g. http://localhost:9222, started with "
+            "--remote-debugging-port=9222) instead of launching one. WebKit is still launched."
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    # Browser launches are subprocess/IO bound and independent, so run each
+    # browser's checks in its own thread.
+    with ThreadPoolExecutor(max_workers=len(args.browsers)) as pool:
+        futures = [
+            pool.submit(run_browser, name, args.url, args.dprs, args.cdp_endpoint)
+            for name in args.browsers
+        ]
+        results = [r for future in futures for r in future.result()]
+    results.sort(key=lambda r: (BROWSERS.index(r.browser), r.dpr))
+
+    for r in results:
+        status = "OK  " if r.ok else "FAIL"
+        detail = r.error or (
+            f"visible={r.visible} clickable={r.clickable} "
+            f"hidden_after_toggle={r.hidden_after_toggle} "
+            f"restored_after_toggle={r.restored_after_toggle}"
+        )
+        print(f"{status} {r.browser:<8} dpr={r.dpr:<5} {detail}")
+
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
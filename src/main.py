@@ -1,7 +1,9 @@
-import base64
+import asyncio
 import json
 import os
 import re
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 
 from fastapi import FastAPI, File, HTTPException, UploadFile
@@ -9,35 +11,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
+from starlette.types import Scope
 
 from .model_loader import initialize_model
 
 model_inference = None
-app = FastAPI(title="Cervical AI Classifier (YOLO)", version="1.0.0")
 
-# Enable CORS for frontend integration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Mount static files (public/ is the canonical site)
-public_dir = os.path.join(os.getcwd(), "public")
-public_path = Path(public_dir)
-cases_path = public_path / "cases"
-
-app.mount("/images", StaticFiles(directory=os.path.join(public_dir, "images")), name="images")
-app.mount("/niivue", StaticFiles(directory=os.path.join(public_dir, "niivue")), name="niivue")
-app.mount("/model", StaticFiles(directory=os.path.join(public_dir, "model")), name="model")
-app.mount("/src", StaticFiles(directory=os.path.join(public_dir, "src")), name="src")
 
-
-# Initialize model on startup
-@app.on_event("startup")
-async def startup_event():
+def load_model():
+    """Load the YOLO model into `model_inference`; leave it None (mock mode) on failure."""
     global model_inference
 
     print("=== STARTUP EVENT STARTING ===")
@@ -70,6 +52,56 @@ async def startup_event():
     print(f"Global model_inference: {model_inference is not None}")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load (and warm up) the model before the server accepts traffic, so the
+    # first request does not pay the weight-loading cost.
+    load_model()
+    yield
+
+
+app = FastAPI(title="Cervical AI Classifier (YOLO)", version="1.0.0", lifespan=lifespan)
+
+# Enable CORS for frontend integration
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Mount static files (public/ is the canonical site)
+public_dir = os.path.join(os.getcwd(), "public")
+public_path = Path(public_dir)
+cases_path = public_path / "cases"
+
+app.mount("/images", StaticFiles(directory=os.path.join(public_dir, "images")), name="images")
+app.mount("/niivue", StaticFiles(directory=os.path.join(public_dir, "niivue")), name="niivue")
+app.mount("/model", StaticFiles(directory=os.path.join(public_dir, "model")), name="model")
+app.mount("/src", StaticFiles(directory=os.path.join(public_dir, "src")), name="src")
+
+
+class CaseFiles(StaticFiles):
+    """Serve public/cases, mapping bare case IDs to their JSON manifest.
+
+    - case IDs (e.g. "CRIC-...") -> "<lowercase>.json"; ids outside [a-z0-9-] are a 400
+    - literal filenames (e.g. "dataset-samples.json", "cric-...-gt.geojson") as-is
+
+    The static viewer fetches `/cases/*.json` while API clients fetch `/cases/<case_id>`;
+    rewriting the path here keeps both on StaticFiles' file serving and traversal checks.
+    """
+
+    def get_path(self, scope: Scope) -> str:
+        path = super().get_path(scope)
+        if path and "." not in path and os.sep not in path:
+            return _case_filename_for_id(path)
+        return path
+
+
+app.mount("/cases", CaseFiles(directory=str(cases_path)), name="cases")
+
+
 class ClassifyReq(BaseModel):
     slide_id: str | None = None
     image_uri: str | None = None
@@ -93,32 +125,34 @@ class ClassifyResp(BaseModel):
     class_summary: dict
 
 
-def _case_file_for_id(case_id: str) -> Path:
-    """Map a case_id to a file under public/cases, rejecting path traversal."""
+class ClassifyUploadResp(BaseModel):
+    filename: str | None
+    boxes: list[Box]
+    total_detections: int
+    class_summary: dict
+
+
+def _case_filename_for_id(case_id: str) -> str:
+    """Map a case_id to its JSON filename under public/cases, rejecting path traversal."""
     case_id = (case_id or "").strip()
     if not case_id:
         raise HTTPException(status_code=400, detail="case_id is required")
     normalized = case_id.lower()
     if not re.fullmatch(r"[a-z0-9-]+", normalized):
         raise HTTPException(status_code=400, detail="invalid case_id")
-    return cases_path / f"{normalized}.json"
+    return f"{normalized}.json"
 
 
-def _case_asset_path_for_request(case_path: str) -> Path:
-    """Map a request path segment to a file under public/cases, rejecting traversal."""
-    case_path = (case_path or "").strip()
-    if not case_path:
-        raise HTTPException(status_code=400, detail="case path is required")
+def _case_file_for_id(case_id: str) -> Path:
+    """Map a case_id to a file under public/cases, rejecting path traversal."""
+    return cases_path / _case_filename_for_id(case_id)
 
-    rel_path = Path(case_path)
-    if rel_path.is_absolute() or ".." in rel_path.parts:
-        raise HTTPException(status_code=400, detail="invalid case path")
 
-    resolved_cases = cases_path.resolve()
-    resolved_target = (cases_path / rel_path).resolve()
-    if resolved_cases != resolved_target and resolved_cases not in resolved_target.parents:
-        raise HTTPException(status_code=400, detail="invalid case path")
-    return resolved_target
+@lru_cache(maxsize=256)
+def _load_case_json(path_str: str, mtime_ns: int) -> dict:
+    """Parse a case file; keyed on mtime so an edited file is re-read on the next request."""
+    with open(path_str, encoding="utf-8") as f:
+        return json.load(f)
 
 
 @app.get("/")
@@ -151,7 +185,7 @@ def apple_touch_icon_precomposed():
     return _serve_public_root_asset("apple-touch-icon-precomposed.png")
 
 
-@app.get("/healthz")
+@app.api_route("/healthz", methods=["GET", "HEAD"])
 def healthz():
     return {
         "ok": True,
@@ -206,8 +240,7 @@ def classify(req: ClassifyReq):
             # For dataset-backed cases, slide_id is expected to match case_id.
             try:
                 case_file = _case_file_for_id(slide_id)
-                with open(case_file, encoding="utf-8") as f:
-                    case_data = json.load(f)
+                case_data = _load_case_json(str(case_file), case_file.stat().st_mtime_ns)
 
                 # Extract image URI from case data
                 slide_data = case_data.get("slides", [{}])[0]
@@ -226,14 +259,11 @@ def classify(req: ClassifyReq):
             print(f"YOLO result: {result}")
             boxes = result["boxes"]
 
-        # Get class summary
-        class_summary = model_inference.get_class_summary(boxes)
-
         return {
             "slide_id": slide_id,
             "boxes": boxes,
             "total_detections": len(boxes),
-            "class_summary": class_summary,
+            "class_summary": result["class_summary"],
         }
 
     except HTTPException:
@@ -244,7 +274,7 @@ def classify(req: ClassifyReq):
         return get_mock_results(slide_id)
 
 
-@app.post("/v1/classify-upload")
+@app.post("/v1/classify-upload", response_model=ClassifyUploadResp)
 async def classify_upload(file: UploadFile = File(...), conf_threshold: float = 0.25):
     """Classify uploaded image file"""
     try:
@@ -254,53 +284,21 @@ async def classify_upload(file: UploadFile = File(...), conf_threshold: float =
         # Read uploaded file
         contents = await file.read()
 
-        # Convert to base64 for processing
-        image_base64 = base64.b64encode(contents).decode()
-        image_input = f"data:image/{file.content_type};base64,{image_base64}"
-
-        # Run inference
-        result = model_inference.predict(image_input, conf_threshold)
+        # Run inference on the encoded bytes directly, off the event loop
+        result = await asyncio.to_thread(model_inference.predict, contents, conf_threshold)
         boxes = result["boxes"]
 
-        # Get class summary
-        class_summary = model_inference.get_class_summary(boxes)
-
         return {
             "filename": file.filename,
             "boxes": boxes,
             "total_detections": len(boxes),
-            "class_summary": class_summary,
+            "class_summary": result["class_summary"],
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Inference failed: {str(e)}") from e
 
 
-@app.get("/cases/{case_id}")
-def get_case(case_id: str):
-    """Serve case assets from public/cases.
-
-    This endpoint supports both:
-    - case IDs (e.g. "CRIC-...") -> mapped to "<lowercase>.json"
-    - literal filenames (e.g. "dataset-samples.json", "cric-...-gt.geojson")
-
-    We use a single endpoint so the static viewer can fetch `/cases/*.json` while API
-    clients can fetch `/cases/<case_id>` without conflicting with a static mount.
-    """
-    path_segment = (case_id or "").strip()
-    if not path_segment:
-        raise HTTPException(status_code=400, detail="case_id is required")
-
-    if "." in path_segment:
-        case_file = _case_asset_path_for_request(path_segment)
-    else:
-        case_file = _case_file_for_id(path_segment)
-
-    if not case_file.exists() or not case_file.is_file():
-        raise HTTPException(status_code=404, detail=f"Case not found: {case_id}")
-    return FileResponse(case_file)
-
-
 def get_mock_results(slide_id: str):
     """Fallback mock results when model fails"""
     mock_results = {
@@ -3,13 +3,147 @@ import contextlib
 import hashlib
 import io
 import os
-from typing import Any
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 import cv2
 import numpy as np
-import torch
-from PIL import Image
-from ultralytics import YOLO
+
+# torch, ultralytics and PIL are imported where they are used: importing the API module
+# (health checks, case files, tests) shouldn't pay for loading them.
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _http_session():
+    """Shared requests.Session so repeated image_uri fetches reuse pooled connections."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+
+                _session = requests.Session()
+    return _session
+
+
+@dataclass(frozen=True)
+class Detections:
+    """Detections for one image as parallel (read-only) arrays, one row per box."""
+
+    xyxy: np.ndarray  # (N, 4) int64 pixel corners
+    score: np.ndarray  # (N,) float confidence
+    cls: np.ndarray  # (N,) int64 class id, -1 if unknown
+
+    def __post_init__(self):
+        for arr in (self.xyxy, self.score, self.cls):
+            arr.setflags(write=False)
+
+    def __len__(self) -> int:
+        return len(self.cls)
+
+    @classmethod
+    def empty(cls) -> "Detections":
+        return cls(
+            xyxy=np.zeros((0, 4), dtype=np.int64),
+            score=np.zeros(0),
+            cls=np.zeros(0, dtype=np.int64),
+        )
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent predict() calls into one batched YOLO forward pass.
+
+    Callers submit an already-decoded image and block on the returned Future; a single
+    worker thread waits up to `max_wait_ms` for up to `max_batch` images, runs them
+    together (grouped by confidence threshold) and hands each caller its own result.
+    """
+
+    def __init__(self, infer, max_batch: int, max_wait_ms: float):
+        self._infer = infer
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        # Held across the closed check and the put, so nothing is queued behind the sentinel.
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="yolo-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, image: np.ndarray, conf_threshold: float) -> Future:
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put((image, conf_threshold, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the worker thread once the images already queued have been processed."""
+        with self._close_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+
+    def _next_batch(self) -> list[tuple[np.ndarray, float, Future]] | None:
+        """Next batch to run, or None once close() has been called and the queue is drained."""
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # stop after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        # Any failure must reach the callers blocked on the futures: an exception escaping
+        # here would kill the only worker thread and hang every later predict().
+        while (batch := self._next_batch()) is not None:
+            try:
+                self._run_batch(batch)
+            except Exception as e:
+                self._fail_pending([future for _, _, future in batch], e)
+
+    def _run_batch(self, batch: list[tuple[np.ndarray, float, Future]]) -> None:
+        groups: dict[float, list[tuple[np.ndarray, Future]]] = defaultdict(list)
+        for image, conf, future in batch:
+            groups[conf].append((image, future))
+
+        for conf, items in groups.items():
+            try:
+                results = self._infer([image for image, _ in items], conf)
+                for (_, future), result in zip(items, results, strict=True):
+                    future.set_result(result)
+            except Exception as e:
+                self._fail_pending([future for _, future in items], e)
+
+    @staticmethod
+    def _fail_pending(futures: list[Future], error: Exception) -> None:
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
 
 
 class YOLOCervicalClassifier:
@@ -24,6 +158,15 @@ class YOLOCervicalClassifier:
         self.model_path = model_path
         self.model_hash: str | None = None
         self.conf_threshold = conf_threshold
+        # TensorRT engines carry their own fused, fixed-precision graph.
+        self.is_trt = str(model_path).endswith(".engine")
+        # FP16 weights/activations for the PyTorch path on GPU (engines are built FP16 already)
+        self.half = str(device).startswith("cuda") and not self.is_trt
+        # Opt-in torch.compile for the PyTorch path: YOLO_TORCH_COMPILE=1 or a torch.compile mode
+        compile_mode = os.environ.get("YOLO_TORCH_COMPILE", "").strip()
+        self.compile_mode: str | bool = False
+        if not self.is_trt and compile_mode.lower() not in ("", "0", "false"):
+            self.compile_mode = True if compile_mode.lower() in ("1", "true") else compile_mode
 
         # load model and metadata
         self.model = self.load_model(model_path)
@@ -33,18 +176,37 @@ class YOLOCervicalClassifier:
             extracted if extracted is not None else ["healthy", "rubbish", "unhealthy", "bothcells"]
         )
 
+        # Optional request micro-batching (YOLO_BATCH_SIZE=1 keeps one forward pass per call)
+        batch_size = int(os.environ.get("YOLO_BATCH_SIZE", "1"))
+        if self.is_trt:
+            # Larger batches fall outside the engine's dynamic profile and are rejected.
+            batch_size = min(batch_size, ENGINE_MAX_BATCH)
+        batch_wait_ms = float(os.environ.get("YOLO_BATCH_WAIT_MS", "10"))
+        self._batcher = (
+            MicroBatcher(self._infer, batch_size, batch_wait_ms) if batch_size > 1 else None
+        )
+
+        # Results for local image files, keyed on (path, mtime_ns, size, conf)
+        self._result_cache: OrderedDict[tuple, dict[str, Any]] = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        self.result_cache_size = 64
+
+    def close(self) -> None:
+        """Release background resources (the micro-batching thread)."""
+        if self._batcher is not None:
+            self._batcher.close()
+
     def _compute_file_hash(self, path: str) -> str | None:
         try:
-            h = hashlib.sha256()
             with open(path, "rb") as f:
-                while chunk := f.read(8192):
-                    h.update(chunk)
-            return h.hexdigest()
+                return hashlib.file_digest(f, "sha256").hexdigest()
         except Exception:
             return None
 
-    def load_model(self, model_path: str) -> YOLO:
+    def load_model(self, model_path: str) -> "YOLO":
         """Load YOLO model from .pt file and try to move to device."""
+        from ultralytics import YOLO
+
         try:
             model = YOLO(model_path)
 
@@ -109,6 +271,8 @@ class YOLOCervicalClassifier:
 
         # 2) Try reading checkpoint file directly (defensive)
         try:
+            import torch
+
             ckpt = torch.load(self.model_path, map_location="cpu")
             if isinstance(ckpt, dict):
                 if "names" in ckpt and ckpt["names"]:
@@ -133,20 +297,27 @@ class YOLOCervicalClassifier:
         return None
 
     def preprocess_image(self, image_input: Any) -> np.ndarray:
-        """Handle different image input types (file path, URL, base64, numpy array)"""
+        """Handle different image input types (file path, URL, base64, raw bytes, numpy array)"""
         try:
             # base64 data URL
             if isinstance(image_input, str) and image_input.startswith("data:image"):
                 image_data = image_input.split(",", 1)[1]
-                image_bytes = base64.b64decode(image_data)
-                image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-                return cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+                image_input = base64.b64decode(image_data)
+
+            # raw encoded bytes (e.g. an uploaded file); OpenCV decodes straight to BGR
+            if isinstance(image_input, bytes | bytearray | memoryview):
+                img = cv2.imdecode(np.frombuffer(image_input, np.uint8), cv2.IMREAD_COLOR)
+                if img is None:
+                    # Fallback for formats this OpenCV build can't decode
+                    from PIL import Image
+
+                    image = Image.open(io.BytesIO(image_input)).convert("RGB")
+                    img = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+                return img
 
             # http(s) url
             if isinstance(image_input, str) and image_input.startswith(("http://", "https://")):
-                import requests
-
-                response = requests.get(image_input, timeout=10)
+                response = _http_session().get(image_input, timeout=10)
                 image_array = np.frombuffer(response.content, np.uint8)
                 img = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
                 return img
@@ -158,6 +329,8 @@ class YOLOCervicalClassifier:
                 # Fallback for WebP if OpenCV lacks WebP support in some environments
                 if img is None and str(image_input).lower().endswith(".webp"):
                     with contextlib.suppress(Exception):
+                        from PIL import Image
+
                         pil_img = Image.open(image_input).convert("RGB")
                         img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
 
@@ -178,176 +351,280 @@ class YOLOCervicalClassifier:
             if conf_threshold is None:
                 conf_threshold = self.conf_threshold
 
-            image = self.preprocess_image(image_input)
-            if image is None:
-                raise ValueError("Failed to load image")
+            # Repeat classifies of an unchanged slide skip decode, preprocess and the forward pass.
+            cache_key = self._result_cache_key(image_input, conf_threshold)
+            if cache_key is not None:
+                with self._result_cache_lock:
+                    cached = self._result_cache.get(cache_key)
+                    if cached is not None:
+                        self._result_cache.move_to_end(cache_key)
+                if cached is not None:
+                    return {
+                        **cached,
+                        "boxes": [dict(b) for b in cached["boxes"]],
+                        "class_summary": dict(cached["class_summary"]),
+                    }
 
-            # Run model inference. Provide device so ultralytics runs on correct device.
-            results = self.model(image, conf=conf_threshold, device=self.device, verbose=False)
+            if self._batcher is None and self._ultralytics_can_read(image_input):
+                # Let Ultralytics load local files itself rather than decoding them here first.
+                result = self._infer([os.fspath(image_input)], conf_threshold)[0]
+                image_shape = result.orig_img.shape
+            else:
+                image = self.preprocess_image(image_input)
+                if image is None:
+                    raise ValueError("Failed to load image")
 
-            # results may be a list or single Results object
-            result = results[0] if isinstance(results, list | tuple) else results
-            boxes = self.process_yolo_results(result, image.shape)
+                if self._batcher is not None:
+                    result = self._batcher.submit(image, conf_threshold).result()
+                else:
+                    result = self._infer([image], conf_threshold)[0]
+                image_shape = image.shape
+            detections = self.extract_detections(result)
+            boxes = self.detections_to_boxes(detections)
 
-            return {
+            prediction = {
                 "boxes": boxes,
-                "image_shape": image.shape,
+                "detections": detections,
+                "class_summary": self._class_summary(detections),
+                "image_shape": image_shape,
                 "total_detections": len(boxes),
             }
+            if cache_key is not None:
+                with self._result_cache_lock:
+                    self._result_cache[cache_key] = {
+                        **prediction,
+                        "boxes": [dict(b) for b in boxes],
+                        "class_summary": dict(prediction["class_summary"]),
+                    }
+                    while len(self._result_cache) > self.result_cache_size:
+                        self._result_cache.popitem(last=False)
+            return prediction
         except Exception as e:
             print(f"Error during YOLO inference: {e}")
             raise
 
-    def process_yolo_results(self, result: Any, image_shape: tuple) -> list[dict]:
+    def warmup(self, runs: int = 1, imgsz: int = 640) -> None:
         """
-        Convert YOLO results to API format. Robust to different ultralytics versions.
-        Ensures label is always a string to satisfy Pydantic/API validation.
+        Run dummy forward passes so the first real request doesn't pay for predictor
+        setup, cuDNN autotuning and kernel compilation.
         """
-        boxes: list[dict] = []
-
+        dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+        for _ in range(runs):
+            self._infer([dummy], self.conf_threshold)
+
+    @staticmethod
+    def _ultralytics_can_read(image_input: Any) -> bool:
+        """True for a local image file this OpenCV build can decode (what Ultralytics uses)."""
+        if not isinstance(image_input, str | os.PathLike):
+            return False
+        path = os.fspath(image_input)
+        if path.startswith(("data:", "http://", "https://")):
+            return False
         try:
-            if result is None:
-                return boxes
+            return os.path.isfile(path) and cv2.haveImageReader(path)
+        except cv2.error:
+            return False
 
-            if getattr(result, "boxes", None) is None:
-                return boxes
+    def _result_cache_key(self, image_input: Any, conf_threshold: float) -> tuple | None:
+        """Cache key for a local image file; None for URLs, data URIs, bytes and arrays."""
+        if not isinstance(image_input, str | os.PathLike):
+            return None
+        path = os.fspath(image_input)
+        if path.startswith(("data:", "http://", "https://")):
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size, float(conf_threshold))
+
+    def _infer(self, images: list[np.ndarray], conf_threshold: float) -> list[Any]:
+        """Run one YOLO forward pass over `images`, returning one Results per image."""
+        # Provide device so ultralytics runs on correct device.
+        # `half` is what the pinned Ultralytics 8.3 accepts (8.4 maps it onto `quantize`).
+        kwargs: dict[str, Any] = {"half": True} if self.half else {}
+        if self.compile_mode:
+            kwargs["compile"] = self.compile_mode
+        results = self.model(
+            images, conf=conf_threshold, device=self.device, verbose=False, **kwargs
+        )
+        # results may be a list or single Results object
+        return list(results) if isinstance(results, list | tuple) else [results]
 
-            # Iterate safely over Box objects or box tensors
-            try:
-                iter_boxes = list(result.boxes)
-            except (AttributeError, TypeError):
-                # fallback: try to build from tensors on result.boxes
-                iter_boxes = []
-                with contextlib.suppress(Exception):
-                    all_xyxy = getattr(result.boxes, "xyxy", None)
-                    all_conf = getattr(result.boxes, "conf", None)
-                    all_cls = getattr(result.boxes, "cls", None)
-                    if all_xyxy is not None:
-                        xy_arr = all_xyxy.cpu().numpy()
-                        conf_arr = (
-                            all_conf.cpu().numpy().flatten()
-                            if all_conf is not None
-                            else [0.0] * len(xy_arr)
-                        )
-                        cls_arr = (
-                            all_cls.cpu().numpy().flatten().astype(int)
-                            if all_cls is not None
-                            else [-1] * len(xy_arr)
-                        )
-                        for i, row in enumerate(xy_arr):
-                            iter_boxes.append((row, conf_arr[i], int(cls_arr[i])))
-
-            # If iter_boxes contains Box objects, parse them; if contains tuples, handle accordingly
-            for b in iter_boxes:
-                xyxy = None
-                conf = None
-                cls_id = None
-
-                # Case A: b is a Box-like object with attributes
-                if not isinstance(b, tuple):
-                    try:
-                        xyxy_attr = getattr(b, "xyxy", None)
-                        if xyxy_attr is not None:
-                            try:
-                                vals = xyxy_attr[0].cpu().numpy()
-                            except (AttributeError, IndexError):
-                                vals = xyxy_attr.cpu().numpy().flatten()
-                            xyxy = [int(v) for v in vals[:4]]
-                    except (AttributeError, TypeError, ValueError):
-                        pass
-
-                    try:
-                        conf_attr = getattr(b, "conf", None)
-                        if conf_attr is not None:
-                            conf = float(conf_attr[0].cpu().numpy())
-                    except (AttributeError, TypeError, ValueError):
-                        pass
-
-                    try:
-                        cls_attr = getattr(b, "cls", None)
-                        if cls_attr is not None:
-                            cls_id = int(cls_attr[0].cpu().numpy())
-                    except (AttributeError, TypeError, ValueError):
-                        pass
+    def _label_for(self, class_id: int) -> str:
+        """Map a class id to a label: self.class_names first, then model.names."""
+        label = f"class_{class_id}"
+        try:
+            if 0 <= class_id < len(self.class_names):
+                return str(self.class_names[class_id])
+            # try model.names mapping (could be dict or list)
+            names_map = getattr(self.model, "names", None) or getattr(
+                getattr(self.model, "model", None), "names", None
+            )
+            if names_map is not None:
+                if isinstance(names_map, dict):
+                    # try numeric key then string key
+                    label = str(names_map.get(class_id, names_map.get(str(class_id), label)))
                 else:
-                    # Case B: b is a tuple (xyxy_row, conf, cls)
-                    try:
-                        row, conf, cls_id = b
-                        xyxy = [int(v) for v in np.array(row)[:4]]
-                        conf = float(conf)
-                        cls_id = int(cls_id)
-                    except (ValueError, TypeError, IndexError):
-                        pass
-
-                # If we still don't have coordinates, skip
-                if xyxy is None:
-                    continue
-
-                x1, y1, x2, y2 = [int(v) for v in xyxy[:4]]
-                w = int(x2 - x1)
-                h = int(y2 - y1)
-
-                class_id = int(cls_id) if cls_id is not None else -1
-                confidence = float(conf) if conf is not None else 0.0
-
-                # Defensive label mapping: try self.class_names (list) first, then model.names
-                label = f"class_{class_id}"
-                try:
-                    if 0 <= class_id < len(self.class_names):
-                        label = str(self.class_names[class_id])
-                    else:
-                        # try model.names mapping (could be dict or list)
-                        names_map = getattr(self.model, "names", None) or getattr(
-                            getattr(self.model, "model", None), "names", None
-                        )
-                        if names_map is not None:
-                            if isinstance(names_map, dict):
-                                # try numeric key then string key
-                                label = str(
-                                    names_map.get(class_id, names_map.get(str(class_id), label))
-                                )
-                            else:
-                                # assume sequence
-                                try:
-                                    label = str(names_map[class_id])
-                                except (IndexError, KeyError, TypeError):
-                                    # fallback: attempt to obtain first item as string
-                                    with contextlib.suppress(Exception):
-                                        label = str(list(names_map)[int(class_id)])
-                except (AttributeError, TypeError, ValueError):
-                    label = str(label)
-
-                boxes.append(
-                    {
-                        "x": int(x1),
-                        "y": int(y1),
-                        "w": int(w),
-                        "h": int(h),
-                        "label": str(label),
-                        "score": float(confidence),
-                        "class_id": int(class_id),
-                    }
-                )
+                    # assume sequence
+                    with contextlib.suppress(IndexError, KeyError, TypeError):
+                        label = str(names_map[class_id])
+        except (AttributeError, TypeError, ValueError):
+            pass
+        return str(label)
+
+    def extract_detections(self, result: Any) -> "Detections":
+        """Pull boxes/scores/classes out of a YOLO Results object as parallel arrays."""
+        try:
+            det = getattr(result, "boxes", None) if result is not None else None
+            all_xyxy = getattr(det, "xyxy", None)
+            if all_xyxy is None:
+                return Detections.empty()
+
+            # One device->host transfer per tensor instead of three per box.
+            xyxy = np.asarray(all_xyxy.cpu().numpy()).reshape(-1, 4).astype(np.int64)
+            n = len(xyxy)
+            all_conf = getattr(det, "conf", None)
+            all_cls = getattr(det, "cls", None)
+            score = (
+                all_conf.cpu().numpy().reshape(-1).astype(float)
+                if all_conf is not None
+                else np.zeros(n)
+            )
+            cls = (
+                all_cls.cpu().numpy().reshape(-1).astype(np.int64)
+                if all_cls is not None
+                else np.full(n, -1, dtype=np.int64)
+            )
+            return Detections(xyxy=xyxy, score=score, cls=cls)
         except Exception as e:
             print("Warning while processing YOLO results:", e)
+            return Detections.empty()
 
+    def detections_to_boxes(self, detections: "Detections") -> list[dict]:
+        """
+        Materialize API box dicts from detections.
+        Ensures label is always a string to satisfy Pydantic/API validation.
+        """
+        xyxy = detections.xyxy
+        wh = xyxy[:, 2:4] - xyxy[:, 0:2]
+        scores = detections.score.tolist()
+        class_ids = detections.cls.tolist()
+        labels: dict[int, str] = {}
+        boxes: list[dict] = []
+        for (x1, y1, _, _), (w, h), score, class_id in zip(
+            xyxy.tolist(), wh.tolist(), scores, class_ids, strict=True
+        ):
+            label = labels.get(class_id)
+            if label is None:
+                label = labels[class_id] = self._label_for(class_id)
+            boxes.append(
+                {
+                    "x": x1,
+                    "y": y1,
+                    "w": w,
+                    "h": h,
+                    "label": label,
+                    "score": score,
+                    "class_id": class_id,
+                }
+            )
         return boxes
 
-    def get_class_summary(self, boxes: list[dict]) -> dict[str, int]:
-        """Get count of each class detected, keyed by the current class_names."""
+    def process_yolo_results(self, result: Any, image_shape: tuple) -> list[dict]:
+        """Convert YOLO results to API format. Robust to different ultralytics versions."""
+        return self.detections_to_boxes(self.extract_detections(result))
+
+    def _class_summary(self, detections: "Detections") -> dict[str, int]:
+        """Count detections per class, keyed by the current class_names."""
         summary: dict[str, int] = dict.fromkeys(self.class_names, 0)
-        for box in boxes:
-            label = str(box.get("label"))
-            if label in summary:
-                summary[label] += 1
-            else:
-                summary.setdefault(label, 0)
-                summary[label] += 1
+        n_names = len(self.class_names)
+        known = (detections.cls >= 0) & (detections.cls < n_names)
+        counts = np.bincount(detections.cls[known], minlength=n_names)
+        for name, count in zip(self.class_names, counts.tolist(), strict=True):
+            summary[name] += count
+        for class_id in detections.cls[~known].tolist():
+            label = self._label_for(class_id)
+            summary[label] = summary.get(label, 0) + 1
         return summary
 
 
 # Global model instance
 model_inference: YOLOCervicalClassifier | None = None
+_model_lock = threading.Lock()
+# Requested checkpoint path -> path actually loaded (e.g. best.pt -> best.engine on GPU)
+_resolved_model_paths: dict[str, str] = {}
+# Largest batch the exported TensorRT engines' dynamic profile accepts.
+ENGINE_MAX_BATCH = 8
+# Calibration set for YOLO_INT8 builds, relative to the repo root rather than the cwd.
+DEFAULT_INT8_DATA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "CRIC_YOLO_Dataset",
+    "data.yaml",
+)
+
+
+def _export_engine(model_path: str, engine_path: str, **export_args) -> str | None:
+    """Return `engine_path`, exporting it from `model_path` if missing; None if the export fails.
+
+    Ultralytics writes `<stem>.engine` next to the weights it exports from, so the export runs
+    on a copy named after `engine_path` in a temporary directory: other engines beside
+    `model_path` are never overwritten, and a failed build leaves nothing behind.
+    """
+    if os.path.exists(engine_path):
+        return engine_path
+    try:
+        from ultralytics import YOLO
+
+        print(f"Exporting TensorRT engine {engine_path} from {model_path} (one-time)...")
+        # Same directory as the target, so the final os.replace is an atomic rename.
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(engine_path))) as tmp:
+            stem = os.path.splitext(os.path.basename(engine_path))[0]
+            weights = shutil.copy2(model_path, os.path.join(tmp, stem + ".pt"))
+            exported = YOLO(weights).export(
+                format="engine",
+                imgsz=640,
+                dynamic=True,
+                batch=ENGINE_MAX_BATCH,
+                workspace=4,
+                **export_args,
+            )
+            os.replace(str(exported), engine_path)
+        return engine_path
+    except Exception as e:
+        print(f"TensorRT export failed for {engine_path}: {e}")
+        return None
+
+
+def resolve_tensorrt_engine(model_path: str, int8_data: str | None = None) -> str:
+    """
+    Return a TensorRT engine next to a `.pt` checkpoint, exporting it on first use.
+
+    Builds an FP16 `<stem>.engine` by default. With `int8_data` (an Ultralytics data.yaml
+    whose val images are used for calibration) an INT8 `<stem>.int8.engine` is preferred,
+    falling back to FP16 when the calibration data is missing or the INT8 build fails.
+    Falls back to the original path when the model isn't a `.pt` file or no engine can be
+    built (e.g. TensorRT isn't installed), so callers can always load the result.
+    """
+    if not model_path.endswith(".pt"):
+        return model_path
+
+    stem = os.path.splitext(model_path)[0]
+    if int8_data:
+        int8_path = stem + ".int8.engine"
+        if os.path.exists(int8_path) or os.path.exists(int8_data):
+            engine = _export_engine(model_path, int8_path, int8=True, data=int8_data)
+            if engine is not None:
+                return engine
+        else:
+            print(f"INT8 calibration data not found ({int8_data}); using FP16 engine")
+
+    engine = _export_engine(model_path, stem + ".engine", half=True)
+    if engine is None:
+        print("Using PyTorch checkpoint")
+        return model_path
+    return engine
 
 
 def initialize_model(model_path: str | None = None) -> YOLOCervicalClassifier:
@@ -358,21 +635,60 @@ def initialize_model(model_path: str | None = None) -> YOLOCervicalClassifier:
       - If a global model is not present -> load given path or default models/best.pt
       - If a global model exists but a different model_path is provided -> reload the model
       - If model_path is None and a model is already loaded -> return existing model
+
+    Safe to call from several threads at once: only one of them loads the model.
     """
     global model_inference
 
+    import torch
+
     default_path = os.path.join(os.path.dirname(__file__), "models", "best.pt")
     model_path = model_path or default_path
 
-    # If already loaded and same path, return existing instance
-    if model_inference is not None and getattr(model_inference, "model_path", None) == model_path:
-        return model_inference
+    # Fast path: already loaded from this path (or from the engine it resolved to).
+    loaded = model_inference
+    if loaded is not None and _resolved_model_paths.get(model_path) == loaded.model_path:
+        return loaded
+
+    with _model_lock:
+        # Determine device; on GPU prefer a TensorRT engine over eager PyTorch.
+        device = "cuda:0" if torch.cuda.is_available() else "cpu"
+        resolved_path = _resolved_model_paths.get(model_path)
+        if resolved_path is None:
+            if device != "cpu":
+                torch.backends.cudnn.benchmark = True
+                torch.set_float32_matmul_precision("high")
+                # YOLO_INT8=1 opts into a calibrated INT8 engine (small accuracy risk).
+                int8_data = (
+                    os.environ.get("YOLO_INT8_DATA", DEFAULT_INT8_DATA)
+                    if os.environ.get("YOLO_INT8") == "1"
+                    else None
+                )
+                resolved_path = resolve_tensorrt_engine(model_path, int8_data=int8_data)
+            else:
+                resolved_path = model_path
+            _resolved_model_paths[model_path] = resolved_path
+
+        # Another thread may have finished loading while we waited for the lock.
+        if (
+            model_inference is not None
+            and getattr(model_inference, "model_path", None) == resolved_path
+        ):
+            return model_inference
 
-    # Determine device
-    device = "cuda:0" if torch.cuda.is_available() else "cpu"
-    print(f"initialize_model: using device: {device}, model_path: {model_path}")
+        print(f"initialize_model: using device: {device}, model_path: {resolved_path}")
 
-    # Load new model (this will raise on error)
-    model_inference = YOLOCervicalClassifier(model_path, device)
-    print("initialize_model: loaded class names:", model_inference.class_names)
-    return model_inference
+        # Load new model (this will raise on error)
+        classifier = YOLOCervicalClassifier(resolved_path, device)
+        print("initialize_model: loaded class names:", classifier.class_names)
+
+        # First pass autotunes on GPU, the second runs on the tuned kernels.
+        try:
+            classifier.warmup(runs=2 if device != "cpu" else 1)
+        except Exception as e:
+            print(f"initialize_model: warmup skipped: {e}")
+
+        previous, model_inference = model_inference, classifier
+        if previous is not None:
+            previous.close()
+        return model_inference
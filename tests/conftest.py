@@ -1,4 +1,95 @@
+import collections
+import contextlib
+import functools
+import json
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
 import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+# CDP endpoint of a Chromium shared by every xdist worker (set by the controller
+# below, or externally to reuse an already-running browser).
+CDP_ENDPOINT_ENV = "PLAYWRIGHT_CDP_ENDPOINT"
+
+# Fixtures that need a real browser; tests using them get the `browser` marker
+# (so `-m "not browser"` deselects them) and PLAYWRIGHT=0 skips them.
+BROWSER_FIXTURES = ("page", "playwright_browser")
+BROWSER_MARKER = "browser"
+
+_shared_browser = None
+
+# Seconds to wait for a test server to answer /healthz (covers model load + warmup).
+SERVER_START_TIMEOUT = 30
+
+
+def _playwright_enabled() -> bool:
+    return os.environ.get("PLAYWRIGHT", "1") != "0"
+
+
+def _read_devtools_port(user_data_dir, timeout=10.0):
+    """Port Chromium bound for --remote-debugging-port=0, from its DevToolsActivePort file"""
+    port_file = Path(user_data_dir) / "DevToolsActivePort"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(FileNotFoundError, ValueError, IndexError):
+            return int(port_file.read_text().splitlines()[0])
+        time.sleep(0.05)
+    raise TimeoutError(f"Chromium did not write {port_file}")
+
+
+def _start_shared_browser(config):
+    """Launch one Chromium on the xdist controller and publish its CDP endpoint.
+
+    Python Playwright has no `launch_server`, so the browser is launched with a
+    remote-debugging port and workers attach with `connect_over_cdp`. Workers
+    inherit the environment variable because they are spawned after configure.
+    Chromium picks the port itself (port 0) and reports it in DevToolsActivePort,
+    so no other process can take it between choosing and binding; that file lives
+    in the user data dir, hence the persistent context.
+    """
+    global _shared_browser
+    from playwright.sync_api import Error, sync_playwright
+
+    user_data_dir = tempfile.mkdtemp(prefix="pytest-chromium-")
+    playwright = sync_playwright().start()
+    _shared_browser = (playwright, None, user_data_dir)
+    try:
+        context = playwright.chromium.launch_persistent_context(
+            user_data_dir, headless=True, args=["--remote-debugging-port=0"]
+        )
+        _shared_browser = (playwright, context, user_data_dir)
+        port = _read_devtools_port(user_data_dir)
+    except (Error, TimeoutError) as err:
+        _stop_shared_browser()
+        config.issue_config_time_warning(
+            pytest.PytestConfigWarning(
+                f"Shared Chromium not started, workers launch their own: {err}"
+            ),
+            stacklevel=2,
+        )
+        return
+    os.environ[CDP_ENDPOINT_ENV] = f"http://127.0.0.1:{port}"
+
+
+def _stop_shared_browser():
+    global _shared_browser
+    if _shared_browser is None:
+        return
+    playwright, context, user_data_dir = _shared_browser
+    _shared_browser = None
+    os.environ.pop(CDP_ENDPOINT_ENV, None)
+    if context is not None:
+        context.close()
+    playwright.stop()
+    shutil.rmtree(user_data_dir, ignore_errors=True)
 
 
 def pytest_configure(config):
@@ -8,6 +99,31 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "slow: marks tests as slow (deselect with '-m \"not slow\"')"
     )
+    config.addinivalue_line("markers", f"{BROWSER_MARKER}: marks tests that drive a real browser")
+
+    is_xdist_controller = not hasattr(config, "workerinput") and bool(
+        getattr(config.option, "numprocesses", None)
+    )
+    # The controller starts the browser before workers spawn and collect, so it cannot
+    # know whether any browser test is selected (-m/-k/paths); PLAYWRIGHT=0 opts out.
+    if is_xdist_controller and _playwright_enabled() and CDP_ENDPOINT_ENV not in os.environ:
+        _start_shared_browser(config)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # tryfirst: the marker must be in place before `-m` deselection runs.
+    skip = pytest.mark.skip(reason="Playwright disabled (PLAYWRIGHT=0)")
+    enabled = _playwright_enabled()
+    for item in items:
+        if any(name in item.fixturenames for name in BROWSER_FIXTURES):
+            item.add_marker(BROWSER_MARKER)
+            if not enabled:
+                item.add_marker(skip)
+
+
+def pytest_unconfigure(config):
+    _stop_shared_browser()
 
 
 # Only suppress warnings that are unavoidable
@@ -16,6 +132,197 @@ def suppress_unavoidable_warnings():
     """Suppress only truly unavoidable warnings"""
     import warnings
 
-    warnings.filterwarnings("ignore", message=".*on_event is deprecated.*")
     warnings.filterwarnings("ignore", message=".*user config directory.*not writeable.*")
     warnings.filterwarnings("ignore", message=".*Creating new Ultralytics Settings.*")
+
+
+@functools.cache
+def load_case_ids(n: int) -> tuple[str, ...]:
+    """Return the first `n` case IDs from public/cases/dataset-samples.json."""
+    repo_root = Path(__file__).resolve().parent.parent
+    index_path = repo_root / "public" / "cases" / "dataset-samples.json"
+    doc = json.loads(index_path.read_text(encoding="utf-8"))
+    case_ids = tuple(c["case_id"] for c in (doc.get("cases") or [])[:n] if "case_id" in c)
+    assert case_ids, "public/cases/dataset-samples.json must contain cases"
+    return case_ids
+
+
+class ServerProcess:
+    """Wrapper for subprocess.Popen with port information"""
+
+    def __init__(self, process, port):
+        self.process = process
+        self.port = port
+
+    def __getattr__(self, name):
+        # Delegate all other attributes to the underlying process
+        return getattr(self.process, name)
+
+
+def bind_listen_socket(port=0):
+    """Bind a listening TCP socket (a free port by default) for a test server to inherit"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("0.0.0.0", port))
+    sock.listen()
+    return sock
+
+
+def _drain_lines(stream, lines):
+    """Read `stream` to EOF, keeping the last lines in the `lines` deque"""
+    with stream:
+        for line in iter(stream.readline, b""):
+            lines.append(line)
+
+
+def start_test_server(port=0, workers=1):
+    """Start a test server with proper module resolution"""
+    # Get the project root directory
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    # Hand uvicorn the already-bound socket (--fd) instead of a port number, so
+    # nothing else can grab the port between picking it and the server binding.
+    with bind_listen_socket(port) as sock:
+        port = sock.getsockname()[1]
+        # Start server using python -m to avoid PYTHONPATH issues
+        cmd = ["python", "-m", "uvicorn", "src.main:app", "--fd", str(sock.fileno())]
+        if workers > 1:
+            # Each worker process runs the lifespan startup (model load) before accepting.
+            cmd += ["--workers", str(workers)]
+        process = subprocess.Popen(
+            cmd,
+            cwd=root_dir,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            pass_fds=(sock.fileno(),),
+        )
+
+    # Keep draining stderr for the server's lifetime: uvicorn logs every request,
+    # and a full pipe would block the server mid-session. App prints go to stdout,
+    # which nothing reads, so it is discarded.
+    stderr_tail = collections.deque(maxlen=200)
+    drain = threading.Thread(target=_drain_lines, args=(process.stderr, stderr_tail), daemon=True)
+    drain.start()
+
+    # The socket is already listening, so a probe connects at once and waits in
+    # the backlog until uvicorn starts accepting (after lifespan startup: model
+    # load + warmup). One HEAD with a read timeout reaching to the deadline is
+    # therefore answered the moment the server is ready; the backoff loop only
+    # covers probes that fail outright.
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    delay = 0.025
+    with requests.Session() as session:
+        while time.monotonic() < deadline:
+            try:
+                response = session.head(
+                    f"http://localhost:{port}/healthz",
+                    timeout=(2, max(deadline - time.monotonic(), 0.1)),
+                )
+                if response.status_code == 200:
+                    break
+            except requests.exceptions.RequestException as err:
+                if process.poll() is not None:
+                    # Process died
+                    drain.join(timeout=1)
+                    stderr = b"".join(stderr_tail).decode(errors="replace")
+                    raise RuntimeError(f"Server failed to start: {stderr}") from err
+            time.sleep(delay)
+            delay = min(delay * 1.6, 0.25)
+        else:
+            # If we get here, server didn't start
+            process.terminate()
+            process.wait()
+            raise RuntimeError(f"Server on port {port} failed to start within timeout")
+
+        # One classify so tests start from a warm server, and only if classify works.
+        try:
+            session.post(
+                f"http://localhost:{port}/v1/classify",
+                json={"slide_id": load_case_ids(1)[0]},
+                timeout=30,
+            ).raise_for_status()
+        except requests.exceptions.RequestException as err:
+            process.terminate()
+            process.wait()
+            raise RuntimeError(f"Warm-up classify failed on port {port}: {err}") from err
+    return ServerProcess(process, port)
+
+
+def stop_test_server(server):
+    """Terminate a server from start_test_server, killing it if it doesn't exit"""
+    server.terminate()
+    try:
+        server.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """Keep-alive HTTP session shared by the API tests (one pooled connection per thread)."""
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        session.mount("http://", adapter)
+        yield session
+
+
+@pytest.fixture(scope="session")
+def server_process():
+    """Start the FastAPI server for integration testing"""
+    server = start_test_server()  # Bind a free port to avoid local port conflicts
+    yield server
+    stop_test_server(server)
+
+
+@pytest.fixture(scope="session")
+def multi_worker_server():
+    """A server with one uvicorn worker process per core (2 to 4), for concurrency tests"""
+    server = start_test_server(workers=max(2, min(4, os.cpu_count() or 2)))
+    yield server
+    stop_test_server(server)
+
+
+@pytest.fixture(scope="session")
+def playwright_browser():
+    """Set up Playwright browser for testing (attach to the shared one under xdist)"""
+    from playwright.sync_api import sync_playwright
+
+    cdp_endpoint = os.environ.get(CDP_ENDPOINT_ENV)
+    with sync_playwright() as p:
+        if cdp_endpoint:
+            # close() only disconnects and drops this worker's contexts.
+            browser = p.chromium.connect_over_cdp(cdp_endpoint)
+        else:
+            browser = p.chromium.launch(headless=True)
+        yield browser
+        browser.close()
+
+
+@pytest.fixture(scope="session")
+def context_pool(playwright_browser):
+    """Idle BrowserContexts reused across tests instead of creating one per test"""
+    idle = []
+    yield idle
+    for context in idle:
+        context.close()
+
+
+@pytest.fixture
+def page(playwright_browser, context_pool):
+    """Create a new browser page for each test in a pooled, cleaned context"""
+    from playwright.sync_api import Error as PlaywrightError
+
+    context = context_pool.pop() if context_pool else playwright_browser.new_context()
+    page = context.new_page()
+    yield page
+    try:
+        with contextlib.suppress(PlaywrightError):  # e.g. about:blank has no storage
+            page.evaluate("() => { localStorage.clear(); sessionStorage.clear(); }")
+        page.close()
+        context.clear_cookies()
+        context.clear_permissions()
+    except PlaywrightError:
+        context.close()  # don't hand a broken context to the next test
+    else:
+        context_pool.append(context)
@@ -60,6 +60,12 @@ class TestHealthEndpoints:
         assert isinstance(data["model_loaded"], bool)
         assert isinstance(data["model_type"], str)
 
+    def test_healthz_head(self, client):
+        """HEAD /healthz is a bodiless liveness probe"""
+        response = client.head("/healthz")
+        assert response.status_code == 200
+        assert response.content == b""
+
     def test_model_info_endpoint(self, client):
         """Test the model info endpoint handles both states gracefully"""
         response = client.get("/model-info")
@@ -216,6 +222,12 @@ class TestCaseEndpoints:
         response = client.get("/cases/does-not-exist")
         assert response.status_code in [404, 400]  # Should not crash
 
+    def test_get_invalid_case_id(self, client):
+        """Case IDs outside [a-z0-9-] are rejected, not looked up"""
+        response = client.get("/cases/CRIC_1")
+        assert response.status_code == 400
+        assert response.json() == {"detail": "invalid case_id"}
+
 
 class TestStaticFiles:
     """Test static file serving doesn't crash"""
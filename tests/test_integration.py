@@ -1,162 +1,103 @@
 """
 Integration tests using Playwright to test the full application stack.
-These tests start the actual server and test real browser interactions.
+API contract tests drive the app in-process with the real model; browser and
+concurrency tests start the actual server and test real browser interactions.
 """
 
 import json
-import os
-import socket
-import subprocess
-import threading
+import re
 import time
 from pathlib import Path
 
+import orjson
 import pytest
-from playwright.sync_api import expect, sync_playwright
-
-# Global lock to ensure resource-intensive tests run sequentially
-_resource_intensive_lock = threading.Lock()
-
-
-class ServerProcess:
-    """Wrapper for subprocess.Popen with port information"""
-
-    def __init__(self, process, port):
-        self.process = process
-        self.port = port
-
-    def __getattr__(self, name):
-        # Delegate all other attributes to the underlying process
-        return getattr(self.process, name)
-
-
-def get_free_port():
-    """Get a free port dynamically"""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.bind(("", 0))
-        s.listen(1)
-        port = s.getsockname()[1]
-    return port
-
-
-def start_test_server(port=None):
-    """Start a test server with proper module resolution"""
-    if port is None:
-        port = get_free_port()
-
-    # Get the project root directory
-    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-    # Start server using python -m to avoid PYTHONPATH issues
-    process = subprocess.Popen(
-        ["python", "-m", "uvicorn", "src.main:app", "--host", "0.0.0.0", "--port", str(port)],
-        cwd=root_dir,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
-
-    # Wait for server to start and verify it's running
-    import requests
-
-    for _attempt in range(15):  # Increased attempts for reliability
-        try:
-            response = requests.get(f"http://localhost:{port}/healthz", timeout=2)
-            if response.status_code == 200:
-                return ServerProcess(process, port)
-        except requests.exceptions.RequestException as err:
-            if process.poll() is not None:
-                # Process died
-                stdout, stderr = process.communicate()
-                raise RuntimeError(f"Server failed to start: {stderr.decode()}") from err
-            time.sleep(0.5)
-
-    # If we get here, server didn't start
-    process.terminate()
-    process.wait()
-    raise RuntimeError(f"Server on port {port} failed to start within timeout")
+from fastapi.testclient import TestClient
+from playwright.sync_api import expect
+
+from src import main
+from src.main import app
+
+from .conftest import load_case_ids
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Page-side helpers installed once per context with add_init_script, so the
+# probes below only ship a short call expression over CDP.
+_JS_TEST_HELPERS = """
+window.__testHelpers = {
+  // Is the sidebar's top-left corner region hit-testable (visible and not occluded)?
+  sidebarOnTop() {
+    const s = document.getElementById('sidebar');
+    if (!s) return false;
+    const r = s.getBoundingClientRect();
+    if (r.width === 0 || r.height === 0) return false;
+    const el = document.elementFromPoint(
+      r.x + Math.min(20, r.width / 2), r.y + Math.min(20, r.height / 2));
+    return Boolean(el && el.closest && el.closest('#sidebar'));
+  },
+};
+"""
+_JS_SIDEBAR_ON_TOP = "() => window.__testHelpers.sidebarOnTop()"
+# Icons/fonts the layout checks don't need. Case data (/cases/) and the slide
+# images (.webp) are never blocked.
+_DECORATIVE_ASSET_RE = re.compile(r"\.(?:png|jpe?g|gif|ico|svg|woff2?|ttf|otf)(?:\?|$)")
+
+
+def _is_decorative_asset(url: str) -> bool:
+    return "/cases/" not in url and bool(_DECORATIVE_ASSET_RE.search(url))
+
+
+_JS_CSS_PROBE = """() => {
+  const sheetHrefs = Array.from(document.querySelectorAll('link[rel="stylesheet"]'))
+    .map(l => l.getAttribute('href') || '')
+    .filter(Boolean);
+  const body = window.getComputedStyle(document.body);
+  const workspace = document.querySelector('.workspace-area');
+  const workspaceStyle = workspace ? window.getComputedStyle(workspace) : null;
+  const glCanvas = document.getElementById('glCanvas');
+  const glCanvasStyle = glCanvas ? window.getComputedStyle(glCanvas) : null;
+  const hasNiivueCssLink = sheetHrefs.some(h => /niivue\\.css(\\?|$)/.test(h));
+  return {
+    hasNiivueCssLink,
+    bodyPosition: body.position,
+    workspaceDisplay: workspaceStyle ? workspaceStyle.display : null,
+    glCanvasPosition: glCanvasStyle ? glCanvasStyle.position : null,
+    sheetHrefs
+  };
+}"""
 
 
 @pytest.fixture(scope="session")
 def dataset_case_ids():
     """Return a small list of dataset-backed case IDs for integration tests."""
-    repo_root = Path(__file__).resolve().parent.parent
-    index_path = repo_root / "public" / "cases" / "dataset-samples.json"
-    doc = json.loads(index_path.read_text(encoding="utf-8"))
-    case_ids = [c["case_id"] for c in (doc.get("cases") or [])[:4] if "case_id" in c]
-    assert case_ids, "public/cases/dataset-samples.json must contain cases"
-    return case_ids
-
+    return load_case_ids(4)
 
-@pytest.fixture(scope="session")
-def server_process():
-    """Start the FastAPI server for integration testing"""
-    server = start_test_server()  # Use a free port to avoid local port conflicts
-
-    yield server
 
-    # Cleanup
-    server.terminate()
-    try:
-        server.wait(timeout=5)
-    except subprocess.TimeoutExpired:
-        server.kill()
+@pytest.fixture(scope="module")
+def asgi_client():
+    """In-process client for API contract tests: full FastAPI stack, no subprocess or socket.
 
-
-@pytest.fixture(scope="function")
-def fresh_server_process():
-    """
-    Start a fresh FastAPI server for resource-intensive tests.
-    Uses a lock to ensure only one resource-intensive test runs at a time.
+    Entering the client runs the app's lifespan startup, which loads the model into
+    src.main; it is unloaded again afterwards because test_api expects the
+    mock fallback.
     """
-    # Acquire lock to ensure sequential execution of resource-intensive tests
-    with _resource_intensive_lock:
-        # Start server with dynamic port allocation
-        server = start_test_server()
-
-        try:
-            yield server
-        finally:
-            # Cleanup - ensure server is fully stopped before releasing lock
-            server.terminate()
-            try:
-                server.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                server.kill()
-                server.wait()  # Ensure it's really dead
-
-            # Small delay to ensure port is fully released
-            time.sleep(0.5)
-
-
-@pytest.fixture(scope="session")
-def playwright_browser():
-    """Set up Playwright browser for testing"""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        yield browser
-        browser.close()
-
-
-@pytest.fixture
-def page(playwright_browser):
-    """Create a new browser page for each test"""
-    context = playwright_browser.new_context()
-    page = context.new_page()
-    yield page
-    context.close()
+    try:
+        with TestClient(app) as client:
+            client.post("/v1/classify", json={"slide_id": load_case_ids(1)[0]})  # warm-up
+            yield client
+    finally:
+        main.model_inference = None
 
 
 class TestAPIIntegration:
     """Test API endpoints through real HTTP requests"""
 
-    def test_health_endpoint_integration(self, server_process, page):
-        """Test health endpoint through browser"""
-        page.goto(f"http://localhost:{server_process.port}/healthz")
+    def test_health_endpoint_integration(self, server_process, http_session):
+        """Test health endpoint over real HTTP"""
+        response = http_session.get(f"http://localhost:{server_process.port}/healthz", timeout=10)
 
-        # Should get JSON response
-        content = page.content()
-        assert "ok" in content
-        assert "true" in content.lower()
+        assert response.status_code == 200
+        assert orjson.loads(response.content).get("ok") is True
 
     def test_api_docs_accessible(self, server_process, page):
         """Test that API documentation is accessible"""
@@ -169,44 +110,28 @@ class TestAPIIntegration:
         expect(page.locator("body")).to_contain_text("/healthz")
         expect(page.locator("body")).to_contain_text("/v1/classify")
 
-    def test_model_info_endpoint_integration(self, server_process, page):
+    def test_model_info_endpoint_integration(self, server_process, http_session):
         """Test model info endpoint returns valid JSON"""
-        page.goto(f"http://localhost:{server_process.port}/model-info")
+        response = http_session.get(
+            f"http://localhost:{server_process.port}/model-info", timeout=10
+        )
 
-        content = page.content()
-        # Should be valid JSON response
-        assert "{" in content and "}" in content
+        assert response.status_code == 200
+        assert isinstance(orjson.loads(response.content), dict)
 
 
 class TestClassifyIntegration:
     """Test classification endpoints with real requests"""
 
-    def test_classify_endpoint_via_curl(self, server_process, dataset_case_ids):
-        """Test classify endpoint using real curl request"""
-        import subprocess
-
+    def test_classify_endpoint(self, asgi_client, dataset_case_ids):
+        """Test classify endpoint with a real model"""
         case_id = dataset_case_ids[0]
-        # Make actual HTTP request
-        result = subprocess.run(
-            [
-                "curl",
-                "-s",
-                "-X",
-                "POST",
-                f"http://localhost:{server_process.port}/v1/classify",
-                "-H",
-                "Content-Type: application/json",
-                "-d",
-                json.dumps({"slide_id": case_id, "conf_threshold": 0.25}),
-            ],
-            capture_output=True,
-            text=True,
+        response = asgi_client.post(
+            "/v1/classify", json={"slide_id": case_id, "conf_threshold": 0.25}
         )
 
-        assert result.returncode == 0, f"Curl failed: {result.stderr}"
-
-        # Parse JSON response
-        response_data = json.loads(result.stdout)
+        assert response.status_code == 200, f"Request failed: {response.text}"
+        response_data = orjson.loads(response.content)
 
         # Verify response structure
         assert "slide_id" in response_data
@@ -215,140 +140,83 @@ class TestClassifyIntegration:
         assert "class_summary" in response_data
         assert response_data["slide_id"] == case_id
 
-    def test_dataset_cases_integration(self, server_process, dataset_case_ids):
-        """Test a few dataset-backed cases work via real HTTP"""
-        import subprocess
-
-        for case_id in dataset_case_ids[:3]:
-            result = subprocess.run(
-                [
-                    "curl",
-                    "-s",
-                    "-X",
-                    "POST",
-                    f"http://localhost:{server_process.port}/v1/classify",
-                    "-H",
-                    "Content-Type: application/json",
-                    "-d",
-                    json.dumps({"slide_id": case_id}),
-                ],
-                capture_output=True,
-                text=True,
-            )
+    @pytest.mark.parametrize("case_id", load_case_ids(3))
+    def test_dataset_cases_integration(self, asgi_client, case_id):
+        """Test a dataset-backed case classifies end to end"""
+        response = asgi_client.post("/v1/classify", json={"slide_id": case_id})
 
-            assert result.returncode == 0, f"Request failed for {case_id}: {result.stderr}"
+        assert response.status_code == 200, f"Request failed for {case_id}: {response.text}"
 
-            response_data = json.loads(result.stdout)
-            assert response_data["slide_id"] == case_id
-            assert isinstance(response_data["boxes"], list)
-            assert isinstance(response_data["total_detections"], int)
+        response_data = orjson.loads(response.content)
+        assert response_data["slide_id"] == case_id
+        assert isinstance(response_data["boxes"], list)
+        assert isinstance(response_data["total_detections"], int)
 
 
 class TestFileUploadIntegration:
     """Test file upload functionality end-to-end"""
 
-    def test_file_upload_via_curl(self, server_process):
-        """Test file upload using real multipart request"""
-        import json
-        import subprocess
-        import tempfile
-
-        from PIL import Image
-
-        # Create a real test image
-        img = Image.new("RGB", (100, 100), color="blue")
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
-            img.save(tmp_file.name)
-
-            # Upload via curl
-            result = subprocess.run(
-                [
-                    "curl",
-                    "-s",
-                    "-X",
-                    "POST",
-                    f"http://localhost:{server_process.port}/v1/classify-upload",
-                    "-F",
-                    f"file=@{tmp_file.name}",
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            # Clean up temp file
-            os.unlink(tmp_file.name)
+    def test_file_upload(self, asgi_client):
+        """Test file upload using a real multipart request"""
+        # A real (solid blue, 100x100) PNG checked in under tests/fixtures/.
+        image_bytes = (FIXTURES_DIR / "upload_100x100.png").read_bytes()
 
-        # Should either succeed or fail gracefully
-        assert result.returncode == 0, f"Upload failed: {result.stderr}"
+        response = asgi_client.post(
+            "/v1/classify-upload", files={"file": ("upload.png", image_bytes, "image/png")}
+        )
 
-        try:
-            response_data = json.loads(result.stdout)
-            # If successful, should have proper structure
-            if "filename" in response_data:
-                assert "boxes" in response_data
-                assert "total_detections" in response_data
-                assert "class_summary" in response_data
-        except json.JSONDecodeError:
-            # If not JSON, should be an error response
-            assert "error" in result.stdout.lower() or "model not loaded" in result.stdout.lower()
+        # Without a model (mock mode) the upload endpoint answers 500 "Model not loaded".
+        if response.status_code == 500:
+            assert response.json() == {"detail": "Model not loaded"}, response.text
+            return
+        assert response.status_code == 200, f"Upload failed: {response.text}"
+        response_data = orjson.loads(response.content)
+        assert response_data["filename"] == "upload.png"
+        assert "boxes" in response_data
+        assert "total_detections" in response_data
+        assert "class_summary" in response_data
 
 
 class TestCaseDataIntegration:
     """Test case data endpoints with real data"""
 
-    def test_case_endpoints_integration(self, server_process):
+    @pytest.mark.parametrize("case_id", load_case_ids(3))
+    def test_case_endpoints_integration(self, asgi_client, case_id):
         """Test case data endpoints return real data"""
-        import json
-        import subprocess
-        from pathlib import Path
-
-        repo_root = Path(__file__).resolve().parent.parent
-        index_path = repo_root / "public" / "cases" / "dataset-samples.json"
-        doc = json.loads(index_path.read_text(encoding="utf-8"))
-        case_ids = [c["case_id"] for c in (doc.get("cases") or [])[:3] if "case_id" in c]
-        assert case_ids, "dataset-samples.json must contain cases for integration tests"
-
-        for case_id in case_ids:
-            result = subprocess.run(
-                ["curl", "-s", f"http://localhost:{server_process.port}/cases/{case_id}"],
-                capture_output=True,
-                text=True,
-            )
+        response = asgi_client.get(f"/cases/{case_id}")
 
-            assert result.returncode == 0, f"Case request failed for {case_id}: {result.stderr}"
+        assert response.status_code == 200, f"Case request failed for {case_id}"
 
-            # Should get valid JSON
-            response_data = json.loads(result.stdout)
-            assert isinstance(response_data, dict)
+        # Should get valid JSON
+        response_data = orjson.loads(response.content)
+        assert isinstance(response_data, dict)
 
 
+@pytest.mark.xdist_group("resource_heavy")
 class TestSystemResilience:
     """Test system behavior under stress and edge conditions"""
 
-    def test_concurrent_requests_integration(self, fresh_server_process, dataset_case_ids):
+    def test_concurrent_requests_integration(
+        self, multi_worker_server, http_session, dataset_case_ids
+    ):
         """Test multiple concurrent requests to real server"""
         import concurrent.futures
-        import json
-        import subprocess
+
+        url = f"http://localhost:{multi_worker_server.port}/v1/classify"
+        # Encode each distinct body once; every request reuses the same bytes.
+        payloads = {cid: json.dumps({"slide_id": cid}).encode() for cid in dataset_case_ids}
 
         def make_request(slide_id):
-            result = subprocess.run(
-                [
-                    "curl",
-                    "-s",
-                    "-X",
-                    "POST",
-                    f"http://localhost:{fresh_server_process.port}/v1/classify",
-                    "-H",
-                    "Content-Type: application/json",
-                    "-d",
-                    f'{{"slide_id": "{slide_id}"}}',
-                ],
-                capture_output=True,
-                text=True,
+            response = http_session.post(
+                url,
+                data=payloads[slide_id],
+                headers={"Content-Type": "application/json"},
+                timeout=30,
             )
-
-            return result.returncode, result.stdout
+            # Decode in the worker thread too, so parsing overlaps the other requests.
+            if not response.ok:
+                return response.status_code, response.text
+            return response.status_code, orjson.loads(response.content)
 
         # Make 10 concurrent requests
         with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
@@ -360,102 +228,74 @@ class TestSystemResilience:
             results = [future.result() for future in futures]
 
         # All should succeed
-        for returncode, stdout in results:
-            assert returncode == 0, f"Request failed: {stdout}"
-            response_data = json.loads(stdout)
+        for status_code, response_data in results:
+            assert status_code == 200, f"Request failed: {response_data}"
             assert "slide_id" in response_data
 
-    def test_malformed_request_handling(self, fresh_server_process):
-        """Test server handles malformed requests gracefully"""
-        import subprocess
-
-        malformed_requests = [
-            '{"invalid": json',  # Invalid JSON
-            "not json at all",  # Not JSON
-            "{}",  # Empty JSON
-        ]
-
-        for payload in malformed_requests:
-            result = subprocess.run(
-                [
-                    "curl",
-                    "-s",
-                    "-X",
-                    "POST",
-                    f"http://localhost:{fresh_server_process.port}/v1/classify",
-                    "-H",
-                    "Content-Type: application/json",
-                    "-d",
-                    payload,
-                ],
-                capture_output=True,
-                text=True,
-            )
-
-            # Should not crash (return code 0) and should have reasonable response
-            assert result.returncode == 0, f"Server crashed on malformed request: {payload}"
+    @pytest.mark.parametrize(
+        "payload, expected_statuses",
+        [
+            ('{"invalid": json', {422}),  # Invalid JSON
+            ("not json at all", {422}),  # Not JSON
+            # Empty JSON falls back to the default slide_id: mock results without
+            # a model, 404 once the model is loaded and the slide isn't a case.
+            ("{}", {200, 404}),
+        ],
+        ids=["invalid-json", "not-json", "empty-object"],
+    )
+    def test_malformed_request_handling(self, asgi_client, payload, expected_statuses):
+        """Test server rejects malformed requests with a client error, not a crash"""
+        response = asgi_client.post(
+            "/v1/classify", content=payload, headers={"Content-Type": "application/json"}
+        )
 
-            # Response should indicate error or fallback behavior
-            assert len(result.stdout) > 0, "Empty response to malformed request"
+        assert response.status_code in expected_statuses, (
+            f"Unexpected {response.status_code} for {payload!r}: {response.text}"
+        )
+        assert len(response.content) > 0, "Empty response to malformed request"
 
 
 class TestPerformanceBaseline:
     """Establish performance baselines for the API"""
 
     @pytest.mark.timeout(30)
-    def test_response_time_baseline(self, server_process, dataset_case_ids):
+    def test_response_time_baseline(self, asgi_client, dataset_case_ids):
         """Measure baseline response times for key endpoints"""
         import statistics
-        import subprocess
-        import time
 
+        # (url, method, body, max average seconds); classify runs the model.
         endpoints = [
-            (f"http://localhost:{server_process.port}/healthz", "GET", None),
-            (f"http://localhost:{server_process.port}/model-info", "GET", None),
-            (
-                f"http://localhost:{server_process.port}/v1/classify",
-                "POST",
-                json.dumps({"slide_id": dataset_case_ids[0]}),
-            ),
+            ("/healthz", "GET", None, 0.2),
+            ("/model-info", "GET", None, 0.2),
+            ("/v1/classify", "POST", {"slide_id": dataset_case_ids[0]}, 2.0),
         ]
 
-        for url, method, data in endpoints:
+        for url, method, data, avg_limit in endpoints:
             times = []
 
             for _ in range(5):  # 5 requests per endpoint
-                start = time.time()
+                start = time.perf_counter()
 
                 if method == "GET":
-                    result = subprocess.run(["curl", "-s", url], capture_output=True)
+                    response = asgi_client.get(url)
                 else:
-                    result = subprocess.run(
-                        [
-                            "curl",
-                            "-s",
-                            "-X",
-                            method,
-                            "-H",
-                            "Content-Type: application/json",
-                            "-d",
-                            data or "{}",  # Ensure data is never None
-                            url,
-                        ],
-                        capture_output=True,
-                    )
-
-                end = time.time()
-
-                assert result.returncode == 0, f"Request failed for {url}"
+                    response = asgi_client.request(method, url, json=data or {})
+
+                end = time.perf_counter()
+
+                assert response.is_success, f"Request failed for {url}"
                 times.append(end - start)
 
             avg_time = statistics.mean(times)
             max_time = max(times)
 
             # Log performance for monitoring
-            print(f"{url}: avg={avg_time:.3f}s, max={max_time:.3f}s")
+            print(f"{url}: avg={avg_time * 1000:.1f}ms, max={max_time * 1000:.1f}ms")
 
             # Reasonable performance expectations
-            assert avg_time < 2.0, f"Average response time too high for {url}: {avg_time:.3f}s"
+            assert avg_time < avg_limit, (
+                f"Average response time too high for {url}: {avg_time:.3f}s"
+            )
             assert max_time < 5.0, f"Max response time too high for {url}: {max_time:.3f}s"
 
 
@@ -468,48 +308,17 @@ class TestStaticViewerLayout:
         url = f"http://localhost:{server_process.port}/"
 
         def sidebar_is_on_top(page) -> bool:
-            box = page.locator("#sidebar").bounding_box()
-            if not box:
-                return False
-            x = box["x"] + min(20, box["width"] / 2)
-            y = box["y"] + min(20, box["height"] / 2)
-            return bool(
-                page.evaluate(
-                    """({x, y}) => {
-                  const el = document.elementFromPoint(x, y);
-                  if (!el) return false;
-                  return Boolean(el.closest && el.closest('#sidebar'));
-                }""",
-                    {"x": x, "y": y},
-                )
-            )
+            # Box lookup and hit test in one round trip.
+            return bool(page.evaluate(_JS_SIDEBAR_ON_TOP))
 
         def run_check(page) -> None:
+            status = page.locator("#status")
             page.goto(url, wait_until="domcontentloaded")
             page.wait_for_selector("#mobileMenuBtn", timeout=10_000)
             page.wait_for_selector("#datasetSamples button", timeout=15_000)
             page.wait_for_function("typeof window.toggleSidebar === 'function'")
 
-            css_probe = page.evaluate(
-                """() => {
-                const sheetHrefs = Array.from(document.querySelectorAll('link[rel="stylesheet"]'))
-                  .map(l => l.getAttribute('href') || '')
-                  .filter(Boolean);
-                const body = window.getComputedStyle(document.body);
-                const workspace = document.querySelector('.workspace-area');
-                const workspaceStyle = workspace ? window.getComputedStyle(workspace) : null;
-                const glCanvas = document.getElementById('glCanvas');
-                const glCanvasStyle = glCanvas ? window.getComputedStyle(glCanvas) : null;
-                const hasNiivueCssLink = sheetHrefs.some(h => /niivue\\.css(\\?|$)/.test(h));
-                return {
-                  hasNiivueCssLink,
-                  bodyPosition: body.position,
-                  workspaceDisplay: workspaceStyle ? workspaceStyle.display : null,
-                  glCanvasPosition: glCanvasStyle ? glCanvasStyle.position : null,
-                  sheetHrefs
-                };
-              }"""
-            )
+            css_probe = page.evaluate(_JS_CSS_PROBE)
             assert not css_probe[
                 "hasNiivueCssLink"
             ], f"Unexpected niivue.css loaded: {css_probe['sheetHrefs']}"
@@ -518,22 +327,8 @@ class TestStaticViewerLayout:
             assert css_probe["glCanvasPosition"] != "absolute"
 
             # Ensure the app has actually loaded a case and painted the image canvas.
-            page.wait_for_function(
-                """() => {
-                const status = document.getElementById('status');
-                if (!status) return false;
-                return (status.textContent || '').toLowerCase().includes('ready');
-              }""",
-                timeout=20_000,
-            )
-            page.wait_for_function(
-                """() => {
-                const dz = document.getElementById('dropZone');
-                if (!dz) return false;
-                return window.getComputedStyle(dz).display === 'none';
-              }""",
-                timeout=20_000,
-            )
+            expect(status).to_contain_text("ready", ignore_case=True, timeout=20_000)
+            expect(page.locator("#dropZone")).to_be_hidden(timeout=20_000)
             page.wait_for_selector("#imageCanvas", timeout=20_000)
 
             assert page.is_visible("#sidebar")
@@ -541,14 +336,7 @@ class TestStaticViewerLayout:
 
             # Click a real button inside the sidebar to ensure it's not occluded.
             page.click("#datasetSamples button")
-            page.wait_for_function(
-                """() => {
-                const status = document.getElementById('status');
-                if (!status) return false;
-                return (status.textContent || '').toLowerCase().includes('ready');
-              }""",
-                timeout=20_000,
-            )
+            expect(status).to_contain_text("ready", ignore_case=True, timeout=20_000)
             assert sidebar_is_on_top(page)
 
             page.click("#mobileMenuBtn")
@@ -561,16 +349,23 @@ class TestStaticViewerLayout:
             assert sidebar_is_on_top(page)
 
         # Approximate browser-zoom/DPR behavior with different device scale factors.
-        for dpr in (1.0, 1.25, 1.5):
-            context = playwright_browser.new_context(
-                viewport={"width": 1280, "height": 720},
-                device_scale_factor=dpr,
-            )
+        # One context/page is reused and the DPR is switched over CDP, so later
+        # loads hit a warm HTTP cache instead of starting from a fresh context.
+        viewport = {"width": 1280, "height": 720}
+        context = playwright_browser.new_context(viewport=viewport, device_scale_factor=1.0)
+        try:
+            context.add_init_script(_JS_TEST_HELPERS)
+            context.route(_is_decorative_asset, lambda route: route.abort())
             page = context.new_page()
-            try:
+            cdp = context.new_cdp_session(page)
+            for dpr in (1.0, 1.25, 1.5):
+                cdp.send(
+                    "Emulation.setDeviceMetricsOverride",
+                    {**viewport, "deviceScaleFactor": dpr, "mobile": False},
+                )
                 run_check(page)
-            finally:
-                context.close()
+        finally:
+            context.close()
 
 
 # Pytest configuration for integration tests
@@ -3,7 +3,10 @@ Tests for model loading functionality.
 """
 
 import os
+import threading
+from pathlib import Path
 
+import numpy as np
 import pytest
 
 
@@ -76,3 +79,307 @@ class TestModelLoader:
             print("Main app imports successfully without model")
         except Exception as e:
             pytest.fail(f"Main app should import even without model: {e}")
+
+
+class TestTensorRTEngineResolution:
+    """resolve_tensorrt_engine picks INT8/FP16 engines without running a real export"""
+
+    @pytest.fixture
+    def export_calls(self, monkeypatch):
+        """Record _export_engine calls; exports to paths in `failing_exports` return None"""
+        from src import model_loader
+
+        calls = []
+
+        def fake_export(model_path, engine_path, **export_args):
+            calls.append((engine_path, export_args))
+            return None if engine_path in self.failing_exports else engine_path
+
+        self.failing_exports = set()
+        monkeypatch.setattr(model_loader, "_export_engine", fake_export)
+        return calls
+
+    def test_int8_engine_preferred_with_calibration_data(self, tmp_path, export_calls):
+        from src.model_loader import resolve_tensorrt_engine
+
+        model_path = str(tmp_path / "best.pt")
+        data = tmp_path / "data.yaml"
+        data.write_text("val: images\n")
+
+        engine = resolve_tensorrt_engine(model_path, int8_data=str(data))
+
+        assert engine == str(tmp_path / "best.int8.engine")
+        assert export_calls == [(engine, {"int8": True, "data": str(data)})]
+
+    def test_falls_back_to_fp16_when_int8_export_fails(self, tmp_path, export_calls):
+        from src.model_loader import resolve_tensorrt_engine
+
+        model_path = str(tmp_path / "best.pt")
+        data = tmp_path / "data.yaml"
+        data.write_text("val: images\n")
+        self.failing_exports.add(str(tmp_path / "best.int8.engine"))
+
+        engine = resolve_tensorrt_engine(model_path, int8_data=str(data))
+
+        assert engine == str(tmp_path / "best.engine")
+        assert [call[0] for call in export_calls] == [
+            str(tmp_path / "best.int8.engine"),
+            str(tmp_path / "best.engine"),
+        ]
+        assert export_calls[1][1] == {"half": True}
+
+    def test_missing_calibration_data_skips_int8(self, tmp_path, export_calls):
+        from src.model_loader import resolve_tensorrt_engine
+
+        model_path = str(tmp_path / "best.pt")
+
+        engine = resolve_tensorrt_engine(model_path, int8_data=str(tmp_path / "missing.yaml"))
+
+        assert engine == str(tmp_path / "best.engine")
+        assert export_calls == [(engine, {"half": True})]
+
+
+class TestMicroBatcher:
+    """MicroBatcher coalescing, error propagation and shutdown, with a fake infer"""
+
+    @staticmethod
+    def make_batcher(infer, max_batch=4, max_wait_ms=50):
+        from src.model_loader import MicroBatcher
+
+        return MicroBatcher(infer, max_batch, max_wait_ms)
+
+    def test_groups_by_conf_threshold(self):
+        calls = []
+
+        def infer(images, conf):
+            calls.append((conf, len(images)))
+            return [(conf, int(image[0])) for image in images]
+
+        batcher = self.make_batcher(infer)
+        futures = [batcher.submit(np.array([i]), conf) for i, conf in enumerate([0.25, 0.5, 0.25])]
+
+        assert [f.result(timeout=5) for f in futures] == [(0.25, 0), (0.5, 1), (0.25, 2)]
+        assert sorted(calls) == [(0.25, 2), (0.5, 1)]
+        batcher.close()
+
+    def test_batches_are_capped_at_max_batch(self):
+        sizes = []
+        release = threading.Event()
+
+        def infer(images, conf):
+            release.wait(5)  # hold the worker so the queue fills up behind it
+            sizes.append(len(images))
+            return [None] * len(images)
+
+        batcher = self.make_batcher(infer, max_batch=2, max_wait_ms=50)
+        futures = [batcher.submit(np.zeros(1), 0.25) for _ in range(5)]
+        release.set()
+
+        for future in futures:
+            future.result(timeout=5)
+        assert sum(sizes) == 5
+        assert max(sizes) <= 2
+        batcher.close()
+
+    def test_exception_reaches_every_future_in_the_batch(self):
+        def infer(images, conf):
+            return []  # wrong length: the strict zip raises while delivering results
+
+        batcher = self.make_batcher(infer)
+        futures = [batcher.submit(np.zeros(1), 0.25) for _ in range(3)]
+
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(timeout=5)
+        # The worker survives and keeps serving.
+        assert batcher._thread.is_alive()
+        batcher.close()
+
+    def test_close_drains_queued_work_then_rejects_submits(self):
+        batcher = self.make_batcher(lambda images, conf: list(range(len(images))))
+        futures = [batcher.submit(np.zeros(1), 0.25) for _ in range(3)]
+        batcher.close()
+
+        assert all(future.result(timeout=5) is not None for future in futures)
+        batcher._thread.join(timeout=5)
+        assert not batcher._thread.is_alive()
+        with pytest.raises(RuntimeError):
+            batcher.submit(np.zeros(1), 0.25)
+
+
+FIXTURE_PNG = Path(__file__).parent / "fixtures" / "upload_100x100.png"
+
+
+class _FakeTensor:
+    """Just enough of a torch tensor for extract_detections (`.cpu().numpy()`)."""
+
+    def __init__(self, values):
+        self._values = np.asarray(values)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._values
+
+
+class _FakeYOLO:
+    """Stands in for ultralytics.YOLO: counts forward passes, returns fixed boxes."""
+
+    names = {0: "healthy", 1: "rubbish", 2: "unhealthy", 3: "bothcells"}
+
+    def __init__(self, cls=(0, 2, 0, 7)):
+        self.cls = cls
+        self.calls = 0
+
+    def __call__(self, images, **kwargs):
+        self.calls += 1
+        n = len(self.cls)
+        boxes = type(
+            "Boxes",
+            (),
+            {
+                "xyxy": _FakeTensor([[10 * i, 5 * i, 10 * i + 4, 5 * i + 3] for i in range(n)]),
+                "conf": _FakeTensor([0.9 - 0.1 * i for i in range(n)]),
+                "cls": _FakeTensor(list(self.cls)),
+            },
+        )()
+        orig_img = np.zeros((100, 100, 3), dtype=np.uint8)
+        return [type("Results", (), {"boxes": boxes, "orig_img": orig_img})() for _ in images]
+
+
+@pytest.fixture
+def fake_classifier(monkeypatch):
+    """A YOLOCervicalClassifier wired to _FakeYOLO instead of real weights"""
+    from src.model_loader import YOLOCervicalClassifier
+
+    monkeypatch.delenv("YOLO_BATCH_SIZE", raising=False)
+    monkeypatch.setattr(YOLOCervicalClassifier, "load_model", lambda self, path: _FakeYOLO())
+    return YOLOCervicalClassifier("fake.pt")
+
+
+class TestResultCache:
+    """predict() reuses results for unchanged local image files only"""
+
+    @pytest.fixture
+    def image_path(self, tmp_path):
+        path = tmp_path / "slide.png"
+        path.write_bytes(FIXTURE_PNG.read_bytes())
+        return str(path)
+
+    def test_hit_on_unchanged_file(self, fake_classifier, image_path):
+        first = fake_classifier.predict(image_path)
+        second = fake_classifier.predict(image_path)
+
+        assert fake_classifier.model.calls == 1
+        assert second["boxes"] == first["boxes"]
+
+    def test_miss_after_mtime_change(self, fake_classifier, image_path):
+        fake_classifier.predict(image_path)
+        st = os.stat(image_path)
+        os.utime(image_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        fake_classifier.predict(image_path)
+
+        assert fake_classifier.model.calls == 2
+
+    def test_miss_after_size_change(self, fake_classifier, image_path):
+        fake_classifier.predict(image_path)
+        st = os.stat(image_path)
+        with open(image_path, "ab") as f:
+            f.write(b"\0")
+        os.utime(image_path, ns=(st.st_atime_ns, st.st_mtime_ns))  # same mtime, new size
+        fake_classifier.predict(image_path)
+
+        assert fake_classifier.model.calls == 2
+
+    def test_bytes_input_not_cached(self, fake_classifier):
+        data = FIXTURE_PNG.read_bytes()
+        fake_classifier.predict(data)
+        fake_classifier.predict(data)
+
+        assert fake_classifier.model.calls == 2
+        assert len(fake_classifier._result_cache) == 0
+
+    def test_lru_eviction(self, fake_classifier, tmp_path):
+        fake_classifier.result_cache_size = 2
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.png"
+            path.write_bytes(FIXTURE_PNG.read_bytes())
+            paths.append(str(path))
+        a, b, c = paths
+
+        for path in (a, b, a, c):  # touching a again makes b the least recently used
+            fake_classifier.predict(path)
+        assert fake_classifier.model.calls == 3
+
+        fake_classifier.predict(a)
+        assert fake_classifier.model.calls == 3  # still cached
+        fake_classifier.predict(b)
+        assert fake_classifier.model.calls == 4  # evicted
+
+    def test_cached_result_not_shared_with_callers(self, fake_classifier, image_path):
+        first = fake_classifier.predict(image_path)
+        expected_boxes = [dict(b) for b in first["boxes"]]
+        expected_summary = dict(first["class_summary"])
+
+        first["boxes"][0]["label"] = "tampered"
+        first["boxes"].clear()
+        first["class_summary"]["healthy"] = 99
+        second = fake_classifier.predict(image_path)
+        second["boxes"][0]["score"] = -1.0
+
+        third = fake_classifier.predict(image_path)
+        assert fake_classifier.model.calls == 1
+        assert third["boxes"] == expected_boxes
+        assert third["class_summary"] == expected_summary
+
+
+class TestDetectionsSummary:
+    """Detections arrays -> class_summary counts and API box dicts"""
+
+    def test_class_summary_and_boxes(self, fake_classifier):
+        from src.model_loader import Detections
+
+        detections = Detections(
+            xyxy=np.array([[0, 0, 4, 3], [10, 5, 14, 8], [20, 10, 25, 16], [1, 2, 3, 4]]),
+            score=np.array([0.9, 0.8, 0.7, 0.6]),
+            cls=np.array([0, 2, 0, 7]),  # 7 is outside class_names
+        )
+
+        assert fake_classifier._class_summary(detections) == {
+            "healthy": 2,
+            "rubbish": 0,
+            "unhealthy": 1,
+            "bothcells": 0,
+            "class_7": 1,
+        }
+        assert fake_classifier.detections_to_boxes(detections) == [
+            {"x": 0, "y": 0, "w": 4, "h": 3, "label": "healthy", "score": 0.9, "class_id": 0},
+            {"x": 10, "y": 5, "w": 4, "h": 3, "label": "unhealthy", "score": 0.8, "class_id": 2},
+            {"x": 20, "y": 10, "w": 5, "h": 6, "label": "healthy", "score": 0.7, "class_id": 0},
+            {"x": 1, "y": 2, "w": 2, "h": 2, "label": "class_7", "score": 0.6, "class_id": 7},
+        ]
+
+    def test_arrays_are_read_only(self):
+        from src.model_loader import Detections
+
+        detections = Detections(
+            xyxy=np.zeros((1, 4), dtype=np.int64), score=np.ones(1), cls=np.zeros(1, dtype=np.int64)
+        )
+
+        with pytest.raises(ValueError):
+            detections.cls[0] = 3
+
+    def test_predict_reports_summary_from_results(self, fake_classifier):
+        prediction = fake_classifier.predict(FIXTURE_PNG.read_bytes())
+
+        assert prediction["total_detections"] == 4
+        assert prediction["class_summary"]["healthy"] == 2
+        assert prediction["class_summary"]["class_7"] == 1
+        assert [b["label"] for b in prediction["boxes"]] == [
+            "healthy",
+            "unhealthy",
+            "healthy",
+            "class_7",
+        ]
@@ -0,0 +1,72 @@
+"""
+Tests for the static dev server's precompressed-asset negotiation.
+"""
+
+import pytest
+from starlette.testclient import TestClient
+
+from scripts.serve_static import accepted_encodings, build_app
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    """Serve a tmp root holding app.js with .br/.gz siblings and plain.js without any"""
+    (tmp_path / "index.html").write_text("<!doctype html>")
+    (tmp_path / "app.js").write_text("plain")
+    (tmp_path / "app.js.br").write_bytes(b"brotli-bytes")
+    (tmp_path / "app.js.gz").write_bytes(b"gzip-bytes")
+    (tmp_path / "plain.js").write_text("only plain")
+    return TestClient(build_app(tmp_path, tmp_path / "index.html"))
+
+
+def fetch(client, path, accept_encoding):
+    """GET without letting the client decode the body, so the raw sibling is visible"""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestPrecompressedStaticFiles:
+    def test_br_preferred_over_gzip(self, static_client):
+        response, body = fetch(static_client, "/app.js", "gzip, br")
+
+        assert response.status_code == 200
+        assert body == b"brotli-bytes"
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["content-type"].startswith("text/javascript")
+
+    def test_br_q0_falls_back_to_gzip(self, static_client):
+        response, body = fetch(static_client, "/app.js", "br;q=0, gzip")
+
+        assert body == b"gzip-bytes"
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    def test_all_refused_serves_plain_file(self, static_client):
+        response, body = fetch(static_client, "/app.js", "br;q=0, gzip;q=0")
+
+        assert body == b"plain"
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    def test_no_precompressed_variant_serves_plain_file(self, static_client):
+        response, body = fetch(static_client, "/plain.js", "br, gzip")
+
+        assert response.status_code == 200
+        assert body == b"only plain"
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate, br", {"gzip": True, "deflate": True, "br": True}),
+        ("br;q=0, gzip;q=0.5", {"br": False, "gzip": True}),
+        ("GZIP;Q=0.0", {"gzip": False}),
+        ("br;q=bogus", {"br": False}),
+        ("", {}),
+    ],
+)
+def test_accepted_encodings(header, expected):
+    assert accepted_encodings(header) == expected